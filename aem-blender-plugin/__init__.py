@@ -1,5 +1,9 @@
-import bpy
-from . import importer, exporter
+try:
+    import bpy
+except ImportError:  # the exporter's worker processes only import the bpy-free modules
+    bpy = None
+if bpy is not None:
+    from . import importer, exporter
 bl_info = {
     "name": "AEM Blender Plugin",
     "author": "Tomasz Zamorski",
@@ -0,0 +1,14 @@
+# aem/__init__.py
+"""Blender-free AEM modules, shared by the Blender addon, Noesis and the command line tools.
+
+Nothing in this package imports bpy, and its modules only import each other
+through relative imports, so the package works the same way wherever it is
+placed:
+
+* Blender imports it as a subpackage of the addon (from .aem import aem_core),
+  also in the exporter's spawned worker processes.
+* Noesis imports it as a top-level package, the aem folder is copied next to
+  fmt_aem.py into plugins/python (from aem import aem_core).
+* Scripts, the tests and the tools run with aem-blender-plugin on sys.path,
+  e.g. python -m aem.aem_convert from inside aem-blender-plugin.
+"""
@@ -0,0 +1,194 @@
+# aem_cache.py
+"""Cache of decoded AEM files, so re-importing an unchanged file skips parsing.
+
+Entries live in a small in-memory LRU for the current session and as .npz
+files on disk, keyed by (absolute path, size, mtime, DECODER_VERSION). The disk
+tier is bounded by size: every hit touches the entry's mtime and the least
+recently used entries are deleted when the total grows past max_bytes."""
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+import numpy as np
+
+from . import aem_core, red
+
+DECODER_VERSION = 2  # bump whenever decoding changes, it invalidates every cached entry
+MAX_BYTES = 512 * 1024 * 1024
+MEMORY_ENTRIES = 32
+
+SUBMESH_ARRAYS = ("pivot", "indices", "positions", "uvs", "normals", "attrs", "bounding_sphere")
+
+
+def default_directory():
+    return os.path.join(tempfile.gettempdir(), "aem_cache")
+
+
+def pack_animation(transform, arrays, prefix):
+    """Stores the tracks of a red.Transform as arrays, returns its key types and scalar fields."""
+    for key_type, track in transform.tracks.items():
+        arrays[f"{prefix}track{key_type}_times"] = track.times
+        arrays[f"{prefix}track{key_type}_values"] = track.values
+    return [list(transform.tracks), transform.timeBetweenFrames, transform.max_time, transform.min_time]
+
+
+def unpack_animation(arrays, prefix, fields):
+    key_types, time_between_frames, max_time, min_time = fields
+    transform = red.Transform()
+    for key_type in key_types:
+        transform.tracks[key_type] = red.Track(arrays[f"{prefix}track{key_type}_times"], arrays[f"{prefix}track{key_type}_values"])
+    transform.set_animation_range_in_time(time_between_frames, max_time, min_time)
+    return transform
+
+
+def to_arrays(aem):
+    """Flattens aem into a dict of arrays for np.savez, metadata goes into a JSON string."""
+    arrays = {}
+    submeshes = []
+    for i, submesh in enumerate(aem.submeshes):
+        prefix = f"s{i}_"
+        for name in SUBMESH_ARRAYS:
+            value = getattr(submesh, name)
+            if value is not None:
+                arrays[prefix + name] = np.asarray(value)
+        animation = None
+        if submesh.animation is not None:
+            animation = pack_animation(submesh.animation, arrays, prefix)
+        submeshes.append({"is_transparent": submesh.is_transparent, "animation": animation})
+    meta = {"version": aem.version, "flags": aem.flags, "submeshes": submeshes}
+    arrays["meta"] = np.array(json.dumps(meta))
+    return arrays
+
+
+def from_arrays(arrays):
+    meta = json.loads(str(arrays["meta"]))
+    aem = aem_core.AEM(meta["version"], meta["flags"])
+    for i, info in enumerate(meta["submeshes"]):
+        prefix = f"s{i}_"
+        submesh = aem_core.Submesh()
+        submesh.index = i
+        for name in SUBMESH_ARRAYS:
+            if prefix + name in arrays:
+                setattr(submesh, name, arrays[prefix + name])
+        submesh.is_transparent = info["is_transparent"]
+        if info["animation"] is not None:
+            submesh.animation = unpack_animation(arrays, prefix, info["animation"])
+        aem.submeshes.append(submesh)
+    return aem
+
+
+def detached(aem):
+    """Copy of aem which owns its arrays.
+
+    Decoded V4/V5 arrays are views into the memory mapped file, holding on to
+    them would keep the file mapped (and locked against writing on Windows)."""
+    return from_arrays({name: np.array(value, copy=True) for name, value in to_arrays(aem).items()})
+
+
+class AEMCache:
+    """Two tier cache of decoded files, safe to use from several threads.
+
+    Cached AEM objects are shared, callers must not modify them."""
+
+    def __init__(self, directory=None, max_bytes=MAX_BYTES, memory_entries=MEMORY_ENTRIES):
+        self.directory = directory or default_directory()
+        self.max_bytes = max_bytes
+        self.memory_entries = memory_entries
+        self.memory = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def key(self, file_path):
+        path = os.path.abspath(file_path)
+        st = os.stat(path)
+        return hashlib.sha1(f"{path}\0{st.st_size}\0{st.st_mtime_ns}\0{DECODER_VERSION}".encode("utf-8")).hexdigest()
+
+    def entry_path(self, key):
+        return os.path.join(self.directory, key + ".npz")
+
+    def remember(self, key, aem):
+        with self.lock:
+            self.memory[key] = aem
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.memory_entries:
+                self.memory.popitem(last=False)
+
+    def get(self, file_path):
+        """Returns the cached AEM of file_path or None."""
+        key = self.key(file_path)
+        with self.lock:
+            aem = self.memory.get(key)
+            if aem is not None:
+                self.memory.move_to_end(key)
+                self.hits += 1
+                return aem
+        entry = self.entry_path(key)
+        try:
+            with np.load(entry, allow_pickle=False) as arrays:
+                aem = from_arrays(arrays)
+            os.utime(entry)  # mark as recently used
+        except (OSError, ValueError, KeyError):
+            with self.lock:
+                self.misses += 1
+            return None
+        self.remember(key, aem)
+        with self.lock:
+            self.hits += 1
+        return aem
+
+    def put(self, file_path, aem):
+        """Stores aem for file_path, returns the detached copy which is kept in memory."""
+        key = self.key(file_path)
+        aem = detached(aem)
+        self.remember(key, aem)
+        os.makedirs(self.directory, exist_ok=True)
+        fd, partial = tempfile.mkstemp(suffix=".part", dir=self.directory)
+        try:
+            with os.fdopen(fd, "wb") as file:
+                np.savez(file, **to_arrays(aem))
+            os.replace(partial, self.entry_path(key))
+        except OSError:
+            if os.path.exists(partial):
+                os.remove(partial)
+            return aem
+        self.evict()
+        return aem
+
+    def load(self, file_path):
+        """Decodes file_path through the cache."""
+        aem = self.get(file_path)
+        if aem is None:
+            aem = self.put(file_path, aem_core.decode(file_path))
+        return aem
+
+    def evict(self):
+        """Deletes least recently used disk entries until they fit max_bytes."""
+        try:
+            entries = []
+            with os.scandir(self.directory) as it:
+                for e in it:
+                    if e.name.endswith(".npz"):
+                        st = e.stat()
+                        entries.append((st.st_mtime, st.st_size, e.path))
+        except OSError:
+            return
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+
+    def clear(self):
+        with self.lock:
+            self.memory.clear()
+        if os.path.isdir(self.directory):
+            for name in os.listdir(self.directory):
+                if name.endswith(".npz"):
+                    os.remove(os.path.join(self.directory, name))
@@ -0,0 +1,187 @@
+# aem_catalog.py
+"""SQLite catalog of .aem asset libraries, built without Blender.
+
+    python -m aem.aem_catalog CATALOG [SOURCE ...] [--workers N] [--query SQL]
+
+Every SOURCE directory is searched recursively and each .aem file is indexed
+with aem_core.aem_index in a process pool, so only headers, count fields and
+animation blocks are read. Refreshing an existing catalog re-indexes only files
+whose size or mtime changed and drops files which no longer exist. --query runs
+a statement against the catalog and prints the rows, e.g.
+
+    python -m aem.aem_catalog assets.db --query "SELECT path FROM assets WHERE max_vertices > 20000"
+"""
+import argparse
+import contextlib
+import os
+import sqlite3
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import aem_core
+from .aem_convert import find_files
+
+SPECIAL_KEY_TYPES = (0x400, 0x800, 0x2000, 0x4000, 0, 0x40000)  # flag 16 keys, see red.Mesh
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    version INTEGER,
+    flags INTEGER,
+    submesh_count INTEGER,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS submeshes (
+    path TEXT NOT NULL REFERENCES files(path) ON DELETE CASCADE,
+    number INTEGER NOT NULL,
+    vertex_count INTEGER NOT NULL,
+    index_count INTEGER NOT NULL,
+    face_count INTEGER NOT NULL,
+    pivot_x REAL, pivot_y REAL, pivot_z REAL,
+    sphere_x REAL, sphere_y REAL, sphere_z REAL, sphere_r REAL,
+    key_count INTEGER NOT NULL,
+    special_key_count INTEGER NOT NULL,
+    duration REAL,
+    PRIMARY KEY (path, number)
+);
+CREATE INDEX IF NOT EXISTS submeshes_vertex_count ON submeshes(vertex_count);
+CREATE INDEX IF NOT EXISTS files_flags ON files(flags);
+CREATE VIEW IF NOT EXISTS assets AS
+    SELECT f.path, f.version, f.flags, f.submesh_count,
+           COALESCE(SUM(s.vertex_count), 0) AS vertices,
+           COALESCE(MAX(s.vertex_count), 0) AS max_vertices,
+           COALESCE(SUM(s.face_count), 0) AS faces,
+           COALESCE(SUM(s.key_count), 0) AS keys,
+           COALESCE(SUM(s.special_key_count), 0) AS special_keys,
+           MAX(s.duration) AS duration
+    FROM files f LEFT JOIN submeshes s ON s.path = f.path
+    WHERE f.error IS NULL
+    GROUP BY f.path;
+"""
+
+
+def connect(catalog_path):
+    db = sqlite3.connect(catalog_path)
+    db.execute("PRAGMA foreign_keys = ON")
+    db.executescript(SCHEMA)
+    return db
+
+
+def animation_summary(file, toc, entry):
+    """Returns (special key count, duration) of a submesh, decoding only its animation block."""
+    if "animation" not in entry.sections:
+        return 0, None
+    file.seek(entry.sections["animation"][0])
+    transform = aem_core.read_animation(file, toc.flags)
+    if transform is None:
+        return 0, None
+    special = sum(len(track) for key_type, track in transform.tracks.items() if key_type in SPECIAL_KEY_TYPES)
+    times = [track.times for track in transform.tracks.values() if len(track)]
+    duration = float(max(t.max() for t in times) - min(t.min() for t in times)) if times else None
+    return special, duration
+
+
+def catalog_file(file_path):
+    """Indexes one file, returns (file row, submesh rows). Runs in worker processes.
+
+    Files which fail to index get a row with the error, so they aren't retried until they change."""
+    try:
+        st = os.stat(file_path)
+    except OSError as e:  # removed since the directory was scanned
+        return (file_path, 0, 0, None, None, None, str(e)), []
+    header = (file_path, st.st_size, st.st_mtime_ns)
+    try:
+        with contextlib.redirect_stdout(sys.stderr), aem_core.reader_for(file_path) as file:
+            # decoder diagnostics stay out of the report
+            toc = aem_core.index_file(file)
+            rows = []
+            for number, entry in enumerate(toc.submeshes, 1):
+                special, duration = animation_summary(file, toc, entry)
+                rows.append(
+                    (file_path, number, entry.vertex_count, entry.index_count, entry.face_count)
+                    + (entry.pivot or (None,) * 3)
+                    + (entry.bounding_sphere or (None,) * 4)
+                    + (entry.key_count, special, duration)
+                )
+    except Exception as e:  # one bad file must not roll back the refresh
+        return header + (None, None, None, f"{type(e).__name__}: {e}"), []
+    return header + (toc.version, toc.flags, len(toc.submeshes), None), rows
+
+
+def stale_files(db, source):
+    """Sorts the .aem files under source into (changed or new paths, paths gone from disk, unchanged count)."""
+    known = {}
+    prefix = source.rstrip(os.sep) + os.sep
+    for path, size, mtime_ns in db.execute("SELECT path, size, mtime_ns FROM files"):
+        if path == source or path.startswith(prefix):
+            known[path] = (size, mtime_ns)
+    changed = []
+    unchanged = 0
+    for file_path in find_files(source):
+        file_path = os.path.abspath(file_path)
+        try:
+            st = os.stat(file_path)
+        except OSError:
+            continue
+        if known.pop(file_path, None) != (st.st_size, st.st_mtime_ns):
+            changed.append(file_path)
+        else:
+            unchanged += 1
+    return changed, list(known), unchanged
+
+
+def refresh(db, sources, workers=None):
+    """Brings the catalog up to date with sources, returns (indexed, failed, removed, unchanged) counts."""
+    changed, removed, unchanged = [], [], 0
+    for source in sources:
+        c, r, u = stale_files(db, os.path.abspath(source))
+        changed.extend(c)
+        removed.extend(r)
+        unchanged += u
+    failed = 0
+    with db:
+        db.executemany("DELETE FROM files WHERE path = ?", ((p,) for p in removed))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for file_row, rows in pool.map(catalog_file, changed, chunksize=64):
+                failed += file_row[-1] is not None
+                db.execute("DELETE FROM files WHERE path = ?", file_row[:1])
+                db.execute("INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?)", file_row)
+                db.executemany("INSERT INTO submeshes VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+    return len(changed) - failed, failed, len(removed), unchanged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="aem.aem_catalog", description="Index .aem files into a SQLite catalog.")
+    parser.add_argument("catalog", help="SQLite database, created if missing")
+    parser.add_argument("sources", nargs="*", help="directories or .aem files to index or refresh")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes, defaults to the CPU count")
+    parser.add_argument("-q", "--query", help="SQL to run after refreshing, rows are printed tab separated")
+    args = parser.parse_args(argv)
+
+    db = connect(args.catalog)
+    try:
+        if args.sources:
+            start = time.perf_counter()
+            indexed, failed, removed, unchanged = refresh(db, args.sources, args.workers)
+            print(
+                f"{indexed} indexed, {failed} failed, {removed} removed, {unchanged} unchanged, "
+                f"{time.perf_counter() - start:.2f} s",
+                file=sys.stderr,
+            )
+        if args.query:
+            try:
+                for row in db.execute(args.query):
+                    print("\t".join("" if v is None else str(v) for v in row))
+            except sqlite3.Error as e:
+                print(f"Query failed: {e}", file=sys.stderr)
+                return 1
+    finally:
+        db.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
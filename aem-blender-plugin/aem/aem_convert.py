@@ -0,0 +1,243 @@
+# aem_convert.py
+"""Batch conversion of .aem files to glTF, GLB or OBJ without Blender.
+
+    python -m aem.aem_convert SOURCE [OUTPUT] [--format gltf|glb|obj] [--workers N] [--resume]
+
+SOURCE is an .aem file or a directory which is searched recursively, the
+directory tree is mirrored under OUTPUT. Files are decoded with aem_core in a
+process pool and one line per file is printed. Animations are not converted.
+AEM is Y up like glTF, so only the V axis of UVs is flipped for glTF."""
+import argparse
+import base64
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from struct import pack
+import numpy as np
+
+from . import aem_core
+
+FORMATS = {
+    "gltf": ".gltf",
+    "glb": ".glb",
+    "obj": ".obj",
+}
+
+GLB_MAGIC = 0x46546C67  # "glTF"
+GLB_JSON = 0x4E4F534A
+GLB_BIN = 0x004E4942
+
+ARRAY_BUFFER = 34962
+ELEMENT_ARRAY_BUFFER = 34963
+FLOAT = 5126
+UNSIGNED_SHORT = 5123
+UNSIGNED_INT = 5125
+
+
+def drawable_submeshes(aem):
+    """Submeshes with at least one triangle, numbered like the Blender importer names its bones."""
+    return [(i, s) for i, s in enumerate(aem.submeshes, 1) if s.face_count and s.vertex_count]
+
+
+def gltf_document(aem, name):
+    """Builds a glTF 2.0 document for aem, returns (gltf dict, binary buffer).
+
+    Every submesh becomes a mesh with its own node, all parented to a node named name."""
+    gltf = {
+        "asset": {"version": "2.0", "generator": "aem_convert"},
+        "scene": 0,
+        "scenes": [{"nodes": [0]}],
+        "nodes": [{"name": name, "children": []}],
+        "meshes": [],
+        "accessors": [],
+        "bufferViews": [],
+        "buffers": [],
+    }
+    buffer = bytearray()
+
+    def add_accessor(array, accessor_type, component_type, target, bounds=False):
+        data = np.ascontiguousarray(array).tobytes()
+        buffer.extend(b"\x00" * (-len(buffer) % 4))
+        gltf["bufferViews"].append({"buffer": 0, "byteOffset": len(buffer), "byteLength": len(data), "target": target})
+        buffer.extend(data)
+        accessor = {
+            "bufferView": len(gltf["bufferViews"]) - 1,
+            "componentType": component_type,
+            "count": len(array),
+            "type": accessor_type,
+        }
+        if bounds:
+            accessor["min"] = array.min(axis=0).tolist()
+            accessor["max"] = array.max(axis=0).tolist()
+        gltf["accessors"].append(accessor)
+        return len(gltf["accessors"]) - 1
+
+    for number, submesh in drawable_submeshes(aem):
+        positions = np.asarray(submesh.positions, dtype="<f4")
+        attributes = {"POSITION": add_accessor(positions, "VEC3", FLOAT, ARRAY_BUFFER, bounds=True)}
+        if aem.normals_present:
+            attributes["NORMAL"] = add_accessor(np.asarray(submesh.normals, dtype="<f4"), "VEC3", FLOAT, ARRAY_BUFFER)
+        if aem.uvs_present:
+            uvs = np.array(submesh.uvs, dtype="<f4")
+            uvs[:, 1] = 1 - uvs[:, 1]
+            attributes["TEXCOORD_0"] = add_accessor(uvs, "VEC2", FLOAT, ARRAY_BUFFER)
+        indices = np.asarray(submesh.indices).ravel()
+        if indices.max() > 0xFFFF:
+            indices = add_accessor(indices.astype("<u4"), "SCALAR", UNSIGNED_INT, ELEMENT_ARRAY_BUFFER)
+        else:
+            indices = add_accessor(indices.astype("<u2"), "SCALAR", UNSIGNED_SHORT, ELEMENT_ARRAY_BUFFER)
+
+        gltf["meshes"].append({"name": f"submesh_{number}", "primitives": [{"attributes": attributes, "indices": indices}]})
+        gltf["nodes"].append({"name": f"submesh_{number}", "mesh": len(gltf["meshes"]) - 1})
+        gltf["nodes"][0]["children"].append(len(gltf["nodes"]) - 1)
+
+    for key in ("meshes", "accessors", "bufferViews"):
+        if not gltf[key]:
+            del gltf[key]
+    if not gltf["nodes"][0]["children"]:
+        del gltf["nodes"][0]["children"]
+    if buffer:
+        buffer.extend(b"\x00" * (-len(buffer) % 4))
+        gltf["buffers"].append({"byteLength": len(buffer)})
+    else:
+        del gltf["buffers"]
+    return gltf, bytes(buffer)
+
+
+def write_gltf(file, aem, name):
+    """.gltf with the buffer embedded as a data URI, so every output is a single file."""
+    gltf, buffer = gltf_document(aem, name)
+    if buffer:
+        gltf["buffers"][0]["uri"] = "data:application/octet-stream;base64," + base64.b64encode(buffer).decode("ascii")
+    file.write(json.dumps(gltf, separators=(",", ":")).encode("utf-8"))
+
+
+def write_glb(file, aem, name):
+    gltf, buffer = gltf_document(aem, name)
+    document = json.dumps(gltf, separators=(",", ":")).encode("utf-8")
+    document += b" " * (-len(document) % 4)
+    length = 12 + 8 + len(document) + (8 + len(buffer) if buffer else 0)
+    file.write(pack("<III", GLB_MAGIC, 2, length))
+    file.write(pack("<II", len(document), GLB_JSON) + document)
+    if buffer:
+        file.write(pack("<II", len(buffer), GLB_BIN) + buffer)
+
+
+def write_obj(file, aem, name):
+    """Wavefront OBJ, one object per submesh. UVs keep the Blender orientation."""
+    text = io.StringIO()
+    text.write(f"# {name}\n")
+    offset = 1
+    for number, submesh in drawable_submeshes(aem):
+        text.write(f"o submesh_{number}\n")
+        np.savetxt(text, submesh.positions, fmt="v %.6f %.6f %.6f")
+        if aem.uvs_present:
+            np.savetxt(text, submesh.uvs, fmt="vt %.6f %.6f")
+        if aem.normals_present:
+            np.savetxt(text, submesh.normals, fmt="vn %.6f %.6f %.6f")
+        corners = np.asarray(submesh.indices, dtype=np.int64).reshape(-1, 3) + offset
+        if aem.uvs_present and aem.normals_present:
+            np.savetxt(text, np.repeat(corners, 3, axis=1), fmt="f %d/%d/%d %d/%d/%d %d/%d/%d")
+        elif aem.normals_present:
+            np.savetxt(text, np.repeat(corners, 2, axis=1), fmt="f %d//%d %d//%d %d//%d")
+        elif aem.uvs_present:
+            np.savetxt(text, np.repeat(corners, 2, axis=1), fmt="f %d/%d %d/%d %d/%d")
+        else:
+            np.savetxt(text, corners, fmt="f %d %d %d")
+        offset += submesh.vertex_count
+    file.write(text.getvalue().encode("utf-8"))
+
+
+WRITERS = {
+    "gltf": write_gltf,
+    "glb": write_glb,
+    "obj": write_obj,
+}
+
+
+def find_files(source):
+    """Sorted .aem files under source, or source itself when it is a file."""
+    if os.path.isfile(source):
+        return [source]
+    found = []
+    for directory, _, names in os.walk(source):
+        found.extend(os.path.join(directory, n) for n in names if n.lower().endswith(".aem"))
+    return sorted(found)
+
+
+def output_path(file_path, source, output, fmt):
+    if os.path.isfile(source):
+        relative = os.path.basename(file_path)
+    else:
+        relative = os.path.relpath(file_path, source)
+    return os.path.join(output, os.path.splitext(relative)[0] + FORMATS[fmt])
+
+
+def up_to_date(file_path, out_path):
+    return os.path.exists(out_path) and os.path.getmtime(out_path) >= os.path.getmtime(file_path)
+
+
+def convert_file(file_path, out_path, fmt):
+    """Converts one file, returns (file_path, error or None, seconds). Runs in worker processes.
+
+    Output is written to a temporary name and renamed when complete, so an
+    interrupted run never leaves a partial file which --resume would skip."""
+    start = time.perf_counter()
+    try:
+        with contextlib.redirect_stdout(sys.stderr):  # decoder diagnostics stay out of the report
+            aem = aem_core.decode(file_path)
+        os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+        partial = out_path + ".part"
+        with open(partial, "wb") as file_out:
+            WRITERS[fmt](file_out, aem, os.path.splitext(os.path.basename(file_path))[0])
+        os.replace(partial, out_path)
+    except Exception as e:  # one bad file must not stop the batch
+        if os.path.exists(out_path + ".part"):
+            os.remove(out_path + ".part")
+        return file_path, f"{type(e).__name__}: {e}", time.perf_counter() - start
+    return file_path, None, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="aem.aem_convert", description="Convert .aem files to glTF, GLB or OBJ.")
+    parser.add_argument("source", help=".aem file or directory searched recursively")
+    parser.add_argument("output", nargs="?", help="output directory, defaults to the source directory")
+    parser.add_argument("-f", "--format", choices=sorted(FORMATS), default="glb")
+    parser.add_argument("-j", "--workers", type=int, default=None, help="worker processes, defaults to the CPU count")
+    parser.add_argument("--resume", action="store_true", help="skip files whose output is newer than the source")
+    args = parser.parse_args(argv)
+
+    source = os.path.normpath(args.source)
+    output = args.output or (os.path.dirname(source) if os.path.isfile(source) else source)
+    jobs = [(f, output_path(f, source, output, args.format)) for f in find_files(source)]
+    skipped = 0
+    if args.resume:
+        pending = [(f, o) for f, o in jobs if not up_to_date(f, o)]
+        skipped = len(jobs) - len(pending)
+        jobs = pending
+
+    failed = 0
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=args.workers) as pool:
+        futures = [pool.submit(convert_file, f, o, args.format) for f, o in jobs]
+        for future in as_completed(futures):
+            file_path, error, seconds = future.result()
+            if error is None:
+                print(f"ok\t{seconds * 1000:.1f} ms\t{file_path}")
+            else:
+                failed += 1
+                print(f"FAILED\t{error}\t{file_path}")
+    print(
+        f"{len(jobs) - failed} converted, {failed} failed, {skipped} up to date, "
+        f"{time.perf_counter() - start:.2f} s",
+        file=sys.stderr,
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
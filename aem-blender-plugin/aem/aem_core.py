@@ -0,0 +1,390 @@
+# aem_core.py
+"""Blender-free AEM decoder.
+
+Parses V1-V5 .aem files into typed NumPy arrays, so the format can be read
+without a running Blender scene (batch tools, Noesis, the asset farm).
+The Blender importer only turns the decoded arrays into scene objects.
+"""
+import os
+import struct
+import threading
+import numpy as np
+
+from . import red
+from .common import FLAGS
+from .read_helper_np import MappedReader, read_array, read_scalar
+from . import fixed_point, strips
+
+VERSION = {
+    "AEMesh\x00": 1,
+    "V2AEMesh\x00": 2,
+    "V3AEMesh\x00": 3,
+    "V4AEMesh\x00": 4,
+    "V5AEMesh\x00": 5,
+}
+
+VERTEX_BLOCKS = ("positions", "uvs", "normals", "attrs")
+
+
+class Submesh:
+    """Decoded submesh. Channels missing from the file are left as None."""
+
+    def __init__(self):
+        self.index = None            # 0 based position in the file
+        self.pivot = None            # float32[3], V3-V5
+        self.indices = None          # uint16[F, 3]
+        self.positions = None        # float32[V, 3]
+        self.uvs = None              # float32[V, 2]
+        self.normals = None          # float32[V, 3]
+        self.attrs = None            # unknown flag 8 block, float32[V, 4] (V4/V5) or int16[V, 2] (V1-V3)
+        self.bounding_sphere = None  # float32[4] (x, y, z, r), V3-V5
+        self.animation = None        # red.Transform, V3-V5
+        self.is_transparent = None   # V1 only
+
+    @property
+    def vertex_count(self):
+        return len(self.positions)
+
+    @property
+    def face_count(self):
+        return len(self.indices)
+
+
+class AEM:
+    """Decoded .aem file: header fields and the list of submeshes."""
+
+    def __init__(self, version, flags):
+        self.version = version
+        self.flags = flags
+        self.submeshes = []
+
+    @property
+    def mesh_present(self):
+        return bool(self.flags & FLAGS["basemesh"])
+
+    @property
+    def uvs_present(self):
+        return bool(self.flags & FLAGS["uvs"])
+
+    @property
+    def normals_present(self):
+        return bool(self.flags & FLAGS["normals"])
+
+    @property
+    def unk_present(self):
+        return bool(self.flags & FLAGS["unk"])
+
+
+def read_magic(file):
+    """Reads the signature and returns the AEM version number."""
+    magic = bytes(file.read(7))
+    if magic != b"AEMesh\x00":
+        magic += bytes(file.read(2))
+    magic = magic.decode("latin-1")
+    if not magic.endswith("AEMesh\x00"):
+        raise ValueError("Unsuppored .aem file. Invalid signature")
+    if magic not in VERSION:
+        raise ValueError(f"Unsupported file AEM version: {magic[:-1]}")
+    return VERSION[magic]
+
+
+def read_v1_indices(file, indices_num):
+    """Reads the index part of a V1 submesh: triangle strips, or a plain triangle list."""
+    pre_strip_pos = file.tell()
+    try:  # handling sepcial case of AEM version 1 and a half
+        indices = read_array(file, np.uint16, indices_num)
+        t_strips_len = read_scalar(file, np.uint16)
+        t_strips = read_array(file, np.int16, t_strips_len)
+        return strips.unpack_strips(indices, t_strips)
+    except (IndexError, ValueError):
+        file.seek(pre_strip_pos)
+        return read_array(file, np.uint16, indices_num, 3)
+
+
+def read_vertex_block(file, version, name, v_num):
+    """Reads the positions, uvs, normals or attrs block of v_num vertices."""
+    if version in (4, 5):
+        width = {"positions": 3, "uvs": 2, "normals": 3, "attrs": 4}[name]
+        block = read_array(file, np.float32, v_num * width, width)
+        if name == "attrs" and np.any(block != 1):
+            print("Abnormality in the unknown values!")
+        return block
+    if name == "positions":
+        if version == 1:
+            return fixed_point.dequantize(read_array(file, np.int16, v_num * 3, 3), 0)
+        return fixed_point.decode_sign_split(read_array(file, np.int16, v_num * 6, 6))
+    if name == "uvs":
+        return fixed_point.decode_uvs(read_array(file, np.int16, v_num * 2, 2))
+    if name == "normals":
+        return fixed_point.decode_normals(read_array(file, np.int16, v_num * 3, 3))
+    return read_array(file, np.int16, v_num * 2, 2)
+
+
+def read_animation(file, flags):
+    """Reads an animation block, returns a red.Transform or None when it is invalid."""
+    anim = red.Mesh()
+    if anim.read_enhanced_data_from_file(file, flags) != -1:
+        return anim.transform
+    return None
+
+
+def vertex_blocks(aem):
+    """Names of the vertex blocks present in the file, in file order."""
+    present = (True, aem.uvs_present, aem.normals_present, aem.unk_present)
+    return [name for name, p in zip(VERTEX_BLOCKS, present) if p]
+
+
+def read_submesh(file, aem):
+    version = aem.version
+    submesh = Submesh()
+    if version in (3, 4, 5):
+        submesh.pivot = read_array(file, np.float32, 3)
+    indices_num = read_scalar(file, np.uint16)
+    if version == 1:
+        submesh.indices = read_v1_indices(file, indices_num)
+    else:
+        submesh.indices = read_array(file, np.uint16, indices_num, 3)
+    v_num = read_scalar(file, np.uint16)
+    for name in vertex_blocks(aem):
+        setattr(submesh, name, read_vertex_block(file, version, name, v_num))
+    if version == 1:
+        submesh.is_transparent = read_scalar(file, np.uint8)
+
+    if version in (3, 4, 5):
+        submesh.bounding_sphere = read_array(file, np.float32, 4)
+        submesh.animation = read_animation(file, aem.flags)
+    return submesh
+
+
+def decode_file(file):
+    """Decodes an .aem file from a binary file object or a MappedReader."""
+    version = read_magic(file)
+    aem = AEM(version, read_scalar(file, np.uint8))
+    if not aem.mesh_present:
+        return aem
+    submesh_num = 1
+    if version in (3, 4, 5):
+        submesh_num = read_scalar(file, np.uint16)
+    for index in range(submesh_num):
+        submesh = read_submesh(file, aem)
+        submesh.index = index
+        aem.submeshes.append(submesh)
+    return aem
+
+
+def reader_for(source):
+    """Adapts the inputs of decode to something with read, tell and seek.
+
+    Noesis' NoeBitStream is read in place from its buffer, starting at its current offset."""
+    if isinstance(source, (str, os.PathLike, bytes, bytearray, memoryview)):
+        return MappedReader(source)
+    if hasattr(source, "getBuffer"):  # NoeBitStream
+        reader = MappedReader(source.getBuffer())
+        reader.seek(source.tell())
+        return reader
+    return source
+
+
+def decode(source):
+    """Decodes an .aem file given as a path, a bytes-like object, a binary file object or a NoeBitStream.
+
+    Paths are memory mapped and buffers are read in place, so float arrays of
+    V4/V5 files are read-only views into the file rather than copies.
+    Raises ValueError for files which are not valid AEM meshes."""
+    return decode_file(reader_for(source))
+
+
+class SubmeshEntry:
+    """Table of contents entry of a submesh, see aem_index."""
+
+    def __init__(self, offset):
+        self.offset = offset         # byte offset of the submesh in the file
+        self.length = 0              # byte length of the submesh, animation included
+        self.sections = {}           # block name -> (offset, length), e.g. "positions"
+        self.index_count = 0         # value of the index count field
+        self.face_count = 0
+        self.vertex_count = 0
+        self.key_count = 0           # animation keys, V3-V5
+        self.pivot = None            # (x, y, z), V3-V5
+        self.bounding_sphere = None  # (x, y, z, r), V3-V5
+
+
+class Index(AEM):
+    """Table of contents of an .aem file, submeshes holds SubmeshEntry objects."""
+
+    def __init__(self, version, flags, size):
+        super().__init__(version, flags)
+        self.size = size
+
+
+# bytes per vertex of every vertex block, for V1, V2/V3 and V4/V5
+VERTEX_BLOCK_SIZES = {
+    1: {"positions": 6, "uvs": 4, "normals": 6, "attrs": 4},
+    2: {"positions": 12, "uvs": 4, "normals": 6, "attrs": 4},
+    4: {"positions": 12, "uvs": 8, "normals": 12, "attrs": 16},
+}
+VERTEX_BLOCK_SIZES[3] = VERTEX_BLOCK_SIZES[2]
+VERTEX_BLOCK_SIZES[5] = VERTEX_BLOCK_SIZES[4]
+
+
+def unpack_from(file, fmt):
+    size = struct.calcsize(fmt)
+    data = file.read(size)
+    if len(data) != size:
+        raise ValueError(f"Unexpected end of file at {file.tell()}")
+    return struct.unpack(fmt, data)
+
+
+def index_submesh(file, toc):
+    """Walks one submesh with its count fields, seeking over the payload."""
+    version = toc.version
+    entry = SubmeshEntry(file.tell())
+
+    def section(name, length):
+        start = file.tell()
+        if start + length > toc.size:
+            raise ValueError(f"Unexpected end of file at {toc.size}")
+        entry.sections[name] = (start, length)
+        file.seek(length, os.SEEK_CUR)
+
+    if version in (3, 4, 5):
+        entry.sections["pivot"] = (file.tell(), 12)
+        entry.pivot = unpack_from(file, "<3f")
+    entry.index_count = indices_num = unpack_from(file, "<H")[0]
+    if version == 1:
+        start = file.tell()
+        entry.face_count = len(read_v1_indices(file, indices_num))
+        entry.sections["indices"] = (start, file.tell() - start)
+    else:
+        if indices_num % 3 != 0:
+            raise ValueError("Array length must be a multiple of 3")
+        entry.face_count = indices_num // 3
+        section("indices", indices_num * 2)
+    entry.vertex_count = v_num = unpack_from(file, "<H")[0]
+    sizes = VERTEX_BLOCK_SIZES[version]
+    for name in vertex_blocks(toc):
+        section(name, v_num * sizes[name])
+    if version == 1:
+        section("is_transparent", 1)
+    if version in (3, 4, 5):
+        entry.sections["bounding_sphere"] = (file.tell(), 16)
+        entry.bounding_sphere = unpack_from(file, "<4f")
+        start = file.tell()
+        # a cut off animation block is dropped like decode drops it, only a following submesh fails
+        entry.key_count = max(red.skip_animation(file, toc.flags), 0)
+        entry.sections["animation"] = (start, file.tell() - start)
+    entry.length = file.tell() - entry.offset
+    return entry
+
+
+def aem_index(source):
+    """Table of contents of an .aem file without decoding its payload.
+
+    Reads the header and every count field, seeking over index, vertex and
+    animation data. Returns an Index with one SubmeshEntry per submesh holding
+    counts, pivot, bounding sphere and the offset and length of every block.
+    Accepts the same sources as decode, raises ValueError for invalid files."""
+    return index_file(reader_for(source))
+
+
+def index_file(file):
+    start = file.tell()
+    size = file.seek(0, os.SEEK_END)
+    file.seek(start)
+    version = read_magic(file)
+    toc = Index(version, unpack_from(file, "<B")[0], size)
+    if not toc.mesh_present:
+        return toc
+    submesh_num = 1
+    if version in (3, 4, 5):
+        submesh_num = unpack_from(file, "<H")[0]
+    for _ in range(submesh_num):
+        toc.submeshes.append(index_submesh(file, toc))
+    return toc
+
+
+CHANNELS = ("positions", "uvs", "normals", "attrs", "animation")
+
+
+class LazySubmesh(Submesh):
+    """Submesh of a file opened with load, its arrays are decoded on first access.
+
+    Channels which weren't selected are None and never read."""
+
+    def __init__(self, file, lock, toc, entry, index, channels):
+        self.file = file
+        self.lock = lock
+        self.toc = toc
+        self.entry = entry
+        self.index = index
+        self.pivot = None if entry.pivot is None else np.array(entry.pivot, dtype=np.float32)
+        self.bounding_sphere = None if entry.bounding_sphere is None else np.array(entry.bounding_sphere, dtype=np.float32)
+        for name in CHANNELS:
+            if name not in channels:
+                setattr(self, name, None)
+
+    @property
+    def vertex_count(self):
+        return self.entry.vertex_count
+
+    @property
+    def face_count(self):
+        return self.entry.face_count
+
+    def __getattr__(self, name):  # only called for attributes which haven't been set yet
+        if name not in ("indices", "is_transparent") + CHANNELS:
+            raise AttributeError(name)
+        value = self.read(name)
+        setattr(self, name, value)
+        return value
+
+    def read(self, name):
+        toc, entry = self.toc, self.entry
+        if name not in entry.sections:
+            return None
+        with self.lock:  # the reader is shared by every submesh of the file
+            self.file.seek(entry.sections[name][0])
+            if name == "indices":
+                if toc.version == 1:
+                    return read_v1_indices(self.file, entry.index_count)
+                return read_array(self.file, np.uint16, entry.index_count, 3)
+            if name == "is_transparent":
+                return read_scalar(self.file, np.uint8)
+            if name == "animation":
+                return read_animation(self.file, toc.flags)
+            return read_vertex_block(self.file, toc.version, name, entry.vertex_count)
+
+    def materialize(self):
+        """Decodes every selected array now, e.g. in a worker thread."""
+        for name in ("indices", "is_transparent") + CHANNELS:
+            getattr(self, name)
+
+
+def load(source, submeshes=None, channels=CHANNELS):
+    """Opens an .aem file for partial loading, see decode for the accepted sources.
+
+    Only the table of contents is read up front (see aem_index), the arrays
+    of a submesh are decoded when they are first accessed. submeshes is an
+    iterable of 0 based submesh indices and channels a subset of CHANNELS,
+    everything else is skipped without being read. Indices, pivot and bounding
+    sphere are always available. Flags of channels which weren't selected
+    are cleared on the returned AEM. Raises ValueError for invalid files or
+    submesh indices out of range."""
+    unknown = set(channels) - set(CHANNELS)
+    if unknown:
+        raise ValueError(f"Unknown channels: {', '.join(sorted(unknown))}")
+    file = reader_for(source)
+    toc = index_file(file)
+    flags = toc.flags
+    for name, flag in (("uvs", "uvs"), ("normals", "normals"), ("attrs", "unk")):
+        if name not in channels:
+            flags &= ~FLAGS[flag]
+    aem = AEM(toc.version, flags)
+    lock = threading.Lock()
+    if submeshes is None:
+        submeshes = range(len(toc.submeshes))
+    for index in submeshes:
+        if not 0 <= index < len(toc.submeshes):
+            raise ValueError(f"Submesh {index + 1} out of range, the file has {len(toc.submeshes)}")
+        aem.submeshes.append(LazySubmesh(file, lock, toc, toc.submeshes[index], index, channels))
+    return aem
@@ -0,0 +1,58 @@
+# aem_pack.py
+"""Blender-free half of the exporter: builds and writes an AEM from extracted mesh arrays.
+
+Kept out of exporter.py so the exporter's worker processes can import it without bpy."""
+import time
+import numpy as np
+
+from . import aem_core, aem_writer, partition, vcache, weld
+
+AEM_FLAGS = 0x17  # basemesh, uvs and normals
+
+
+def cache_report(submeshes):
+    """ACMR and ATVR over all submeshes (vertex transforms per triangle and per vertex)."""
+    misses = sum(vcache.cache_misses(s.indices) for s in submeshes)
+    faces = sum(len(s.indices) for s in submeshes)
+    vertices = sum(len(s.positions) for s in submeshes)
+    return misses / max(faces, 1), misses / max(vertices, 1)
+
+
+def pack_aem(arrays, file_path, aem_version, dedup=True, precision=6, optimize_cache=False, tolerance=0.01):
+    """Builds and writes an AEM from the arrays of extract_mesh, returns a dict of export statistics.
+
+    Doesn't touch bpy, so several meshes can be packed in worker processes.
+    aem_version None picks the smallest version whose quantization error stays within tolerance."""
+    start = time.perf_counter()
+    positions, uvs, normals, indices = arrays
+    stats = {"vertices_before": len(positions)}
+    if dedup:
+        (positions, uvs, normals), indices = weld.deduplicate(indices, [positions, uvs, normals], precision)
+    stats["vertices_after"] = len(positions)
+
+    aem = aem_core.AEM(aem_version, AEM_FLAGS)
+    for (positions, uvs, normals), indices in partition.split_submeshes(indices, [positions, uvs, normals]):
+        submesh = aem_core.Submesh()
+        submesh.pivot = np.zeros(3, dtype=np.float32)
+        submesh.indices = indices
+        submesh.positions = positions
+        submesh.uvs = uvs
+        submesh.normals = normals
+        submesh.bounding_sphere = partition.bounding_sphere(positions)
+        aem.submeshes.append(submesh)
+    stats["submeshes"] = len(aem.submeshes)
+    if optimize_cache:
+        stats["acmr_before"], stats["atvr_before"] = cache_report(aem.submeshes)
+        for submesh in aem.submeshes:
+            (submesh.positions, submesh.uvs, submesh.normals), submesh.indices = vcache.optimize(
+                submesh.indices, [submesh.positions, submesh.uvs, submesh.normals]
+            )
+        stats["acmr_after"], stats["atvr_after"] = cache_report(aem.submeshes)
+    if aem_version is None:
+        aem.version = aem_writer.smallest_version(aem, tolerance)
+    stats["version"] = aem.version
+    if aem.version <= 3:
+        stats["errors"] = aem_writer.quantization_errors(aem)
+    aem_writer.write(file_path, aem, stats)
+    stats["pack_time"] = time.perf_counter() - start
+    return stats
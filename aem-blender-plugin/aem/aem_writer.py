@@ -0,0 +1,231 @@
+# aem_writer.py
+"""Blender-free AEM writer, the counterpart of aem_core.
+
+Takes an aem_core.AEM filled with NumPy arrays and writes every section
+with a single ndarray.tobytes() call."""
+import io
+import os
+from struct import pack
+import numpy as np
+
+from . import aem_core, fixed_point, strips
+from .read_helper_np import MappedReader
+
+MAGIC = {
+    1: b"AEMesh\x00",
+    2: b"V2AEMesh\x00",
+    3: b"V3AEMesh\x00",
+    4: b"V4AEMesh\x00",
+    5: b"V5AEMesh\x00",
+}
+
+MAX_INDEX_COUNT = 0xFFFF
+MAX_VERTEX_COUNT = 0xFFFF
+DEFAULT_BOUNDING_SPHERE = (0, 0, 0, 1000)
+
+
+def empty_animation(flags):
+    """Animation block without any keyframes: translation, rotation and scale with 0 keys."""
+    data = pack("<6h", 1, 0, 1, 0, 1, 0)
+    if flags & (8 | 16):
+        data += pack("<h", 0)
+    if flags & 16:
+        data += pack("<h", 0)  # no special keys
+    return data
+
+
+def array_bytes(array, dtype, shape):
+    array = np.asarray(array)
+    if array.shape != shape:
+        raise ValueError(f"Expected array of shape {shape}, got {array.shape}")
+    return np.ascontiguousarray(array, dtype=np.dtype(dtype).newbyteorder("<")).tobytes()
+
+
+def v1_index_block(submesh, aem, stats=None):
+    """Index part of a V1 submesh: triangle strips, or a plain list when strips don't pay off.
+
+    The strip-less layout is only used when the reader can tell it apart from
+    strips (it probes for strips first), otherwise strips are written anyway."""
+    indices = np.asarray(submesh.indices).reshape(-1, 3)
+    strip_indices, strip_lengths = strips.stripify(indices)
+    if len(strip_indices) > MAX_INDEX_COUNT or len(strip_lengths) > MAX_INDEX_COUNT:
+        raise ValueError(f"Triangle strips need {len(strip_indices)} indices in {len(strip_lengths)} strips, at most {MAX_INDEX_COUNT} are supported")
+    block = (
+        pack("<H", len(strip_indices)) + array_bytes(strip_indices, np.uint16, strip_indices.shape)
+        + pack("<H", len(strip_lengths)) + array_bytes(strip_lengths, np.int16, strip_lengths.shape)
+    )
+    written = len(strip_indices) + len(strip_lengths) + 1
+    if written >= indices.size:
+        list_block = pack("<H", indices.size) + array_bytes(indices, np.uint16, indices.shape)
+        try:
+            probe = aem_core.read_submesh(MappedReader(list_block + v1_vertex_block(submesh, aem)), aem)
+            if np.array_equal(probe.indices, indices):
+                block = list_block
+                written = indices.size
+        except ValueError:
+            pass
+    if stats is not None:
+        stats["indices_list"] = stats.get("indices_list", 0) + indices.size
+        stats["indices_written"] = stats.get("indices_written", 0) + written
+    return block
+
+
+def v1_vertex_block(submesh, aem):
+    """Vertex part of a V1 submesh: short positions, Q12 UVs, Q15 normals."""
+    v_num = len(submesh.positions)
+    data = pack("<H", v_num) + fixed_point.quantize(submesh.positions, 0).astype("<i2").tobytes()
+    if aem.uvs_present:
+        data += fixed_point.quantize(submesh.uvs, fixed_point.UV_FRAC_BITS).astype("<i2").tobytes()
+    if aem.normals_present:
+        data += fixed_point.quantize(submesh.normals, fixed_point.NORMALS_FRAC_BITS).astype("<i2").tobytes()
+    if aem.unk_present:
+        attrs = submesh.attrs if submesh.attrs is not None else np.zeros((v_num, 2), dtype=np.int16)
+        data += array_bytes(attrs, np.int16, (v_num, 2))
+    return data + pack("<B", submesh.is_transparent or 0)
+
+
+def write_submesh_v1(file, submesh, aem, stats=None):
+    v_num = len(submesh.positions)
+    if v_num > MAX_VERTEX_COUNT or np.asarray(submesh.indices).size > MAX_INDEX_COUNT:
+        raise ValueError(f"Submesh has {v_num} vertices, at most {MAX_VERTEX_COUNT} are supported")
+    if np.asarray(submesh.indices).size and np.asarray(submesh.indices).max() >= v_num:
+        raise ValueError("Face index out of vertex range")
+    file.write(v1_index_block(submesh, aem, stats))
+    file.write(v1_vertex_block(submesh, aem))
+
+
+def write_submesh_v23(file, submesh, aem):
+    """V2/V3 submesh: (value, sign) short positions, Q12 UVs, Q15 normals."""
+    indices = np.asarray(submesh.indices)
+    v_num = len(submesh.positions)
+    if indices.size > MAX_INDEX_COUNT or v_num > MAX_VERTEX_COUNT:
+        raise ValueError(
+            f"Submesh has {indices.size} indices and {v_num} vertices, at most {MAX_VERTEX_COUNT} are supported"
+        )
+    if indices.size and indices.max() >= v_num:
+        raise ValueError("Face index out of vertex range")
+    if aem.version == 3:
+        pivot = submesh.pivot if submesh.pivot is not None else (0, 0, 0)
+        file.write(array_bytes(pivot, np.float32, (3,)))
+    file.write(pack("<H", indices.size))
+    file.write(array_bytes(indices.reshape(-1, 3), np.uint16, (indices.size // 3, 3)))
+    file.write(pack("<H", v_num))
+    file.write(fixed_point.encode_sign_split(submesh.positions).astype("<i2").tobytes())
+    if aem.uvs_present:
+        file.write(fixed_point.quantize(submesh.uvs, fixed_point.UV_FRAC_BITS).astype("<i2").tobytes())
+    if aem.normals_present:
+        file.write(fixed_point.quantize(submesh.normals, fixed_point.NORMALS_FRAC_BITS).astype("<i2").tobytes())
+    if aem.unk_present:
+        attrs = submesh.attrs if submesh.attrs is not None else np.zeros((v_num, 2), dtype=np.int16)
+        file.write(array_bytes(attrs, np.int16, (v_num, 2)))
+    if aem.version == 3:
+        bounding_sphere = submesh.bounding_sphere
+        if bounding_sphere is None:
+            bounding_sphere = DEFAULT_BOUNDING_SPHERE
+        file.write(array_bytes(bounding_sphere, np.float32, (4,)))
+        file.write(empty_animation(aem.flags))
+
+
+def write_submesh(file, submesh, aem):
+    indices = np.asarray(submesh.indices)
+    v_num = len(submesh.positions)
+    if indices.size > MAX_INDEX_COUNT or v_num > MAX_VERTEX_COUNT:
+        raise ValueError(
+            f"Submesh has {indices.size} indices and {v_num} vertices, at most {MAX_VERTEX_COUNT} are supported"
+        )
+    if indices.size and indices.max() >= v_num:
+        raise ValueError("Face index out of vertex range")
+
+    pivot = submesh.pivot if submesh.pivot is not None else (0, 0, 0)
+    file.write(array_bytes(pivot, np.float32, (3,)))
+    file.write(pack("<H", indices.size))
+    file.write(array_bytes(indices.reshape(-1, 3), np.uint16, (indices.size // 3, 3)))
+    file.write(pack("<H", v_num))
+    file.write(array_bytes(submesh.positions, np.float32, (v_num, 3)))
+    if aem.uvs_present:
+        file.write(array_bytes(submesh.uvs, np.float32, (v_num, 2)))
+    if aem.normals_present:
+        file.write(array_bytes(submesh.normals, np.float32, (v_num, 3)))
+    if aem.unk_present:
+        attrs = submesh.attrs if submesh.attrs is not None else np.ones((v_num, 4), dtype=np.float32)
+        file.write(array_bytes(attrs, np.float32, (v_num, 4)))
+
+    bounding_sphere = submesh.bounding_sphere
+    if bounding_sphere is None:
+        bounding_sphere = DEFAULT_BOUNDING_SPHERE
+    file.write(array_bytes(bounding_sphere, np.float32, (4,)))
+    file.write(empty_animation(aem.flags))
+
+
+def write_file(file, aem, stats=None):
+    """Writes aem (an aem_core.AEM) to a binary file object.
+
+    When a stats dict is given, V1 strip encoding records the index count of
+    the triangle list and the count actually written (strips and strip lengths)."""
+    if aem.version not in MAGIC:
+        raise ValueError(f"Writing AEM version {aem.version} is not supported")
+    if aem.version in (1, 2):
+        if len(aem.submeshes) != 1:
+            raise ValueError(f"AEM version {aem.version} holds exactly one submesh, got {len(aem.submeshes)}")
+        file.write(MAGIC[aem.version] + pack("<B", aem.flags))
+        if aem.version == 1:
+            write_submesh_v1(file, aem.submeshes[0], aem, stats)
+        else:
+            write_submesh_v23(file, aem.submeshes[0], aem)
+        return
+    file.write(MAGIC[aem.version] + pack("<BH", aem.flags, len(aem.submeshes)))
+    for submesh in aem.submeshes:
+        if aem.version == 3:
+            write_submesh_v23(file, submesh, aem)
+        else:
+            write_submesh(file, submesh, aem)
+
+
+def write(target, aem, stats=None):
+    """Writes aem to a path or a binary file object."""
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, "wb") as file_aem:
+            write_file(file_aem, aem, stats)
+    else:
+        write_file(target, aem, stats)
+
+
+def quantization_errors(aem, version=None):
+    """Per channel (max, rms) error of storing aem as the given (by default its own) version.
+
+    V4/V5 store floats and have no quantization error."""
+    version = aem.version if version is None else version
+    channels = {"positions": ("positions", 0)}
+    if aem.uvs_present:
+        channels["uvs"] = ("uvs", fixed_point.UV_FRAC_BITS)
+    if aem.normals_present:
+        channels["normals"] = ("normals", fixed_point.NORMALS_FRAC_BITS)
+    errors = {}
+    for channel, (attr, frac_bits) in channels.items():
+        if version in (4, 5):
+            errors[channel] = (0.0, 0.0)
+            continue
+        values = [getattr(s, attr) for s in aem.submeshes]
+        values = np.concatenate([np.asarray(v, dtype=np.float32).ravel() for v in values])
+        errors[channel] = fixed_point.quantization_error(values, frac_bits)
+    return errors
+
+
+def smallest_version(aem, tolerance, candidates=(2, 3, 5)):
+    """Picks the candidate version with the smallest file whose quantization error stays within tolerance.
+
+    V2 only holds one submesh and is skipped for split meshes. Falls back to
+    the last candidate when nothing else fits."""
+    best = None
+    for version in candidates:
+        if version in (1, 2) and len(aem.submeshes) != 1:
+            continue
+        if any(max_error > tolerance for max_error, _ in quantization_errors(aem, version).values()):
+            continue
+        version_aem = aem_core.AEM(version, aem.flags)
+        version_aem.submeshes = aem.submeshes
+        buffer = io.BytesIO()
+        write_file(buffer, version_aem)
+        if best is None or buffer.tell() < best[1]:
+            best = (version, buffer.tell())
+    return best[0] if best is not None else candidates[-1]
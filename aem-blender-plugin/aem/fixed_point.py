@@ -0,0 +1,70 @@
+# fixed_point.py
+"""Vectorized conversion between floats and the fixed point (Qn) and sign split shorts used by V1-V3 meshes."""
+import numpy as np
+
+UV_FRAC_BITS = 12  # Q12
+NORMALS_FRAC_BITS = 15  # Q15
+
+
+def dequantize(block, frac_bits, out=None):
+    """Converts Qn shorts into float32, e.g. Q8: 315 -> 315 / 2^8 = 1.23046875."""
+    block = np.asarray(block)
+    if out is None:
+        out = np.empty(block.shape, dtype=np.float32)
+    np.multiply(block, np.float32(1.0 / (1 << frac_bits)), out=out, casting="unsafe")
+    return out
+
+
+def decode_sign_split(block, out=None):
+    """Decodes V2/V3 (value, sign) short pairs, block is int16[V, 6] as (x, xs, y, ys, z, zs).
+
+    If cord is negative sign bits are FFFF else they are 0000. A value whose
+    sign word disagrees with its own sign is negated. value >> 15 gives the sign
+    word a consistent value would have, so one comparison finds the mismatches."""
+    block = np.asarray(block, dtype=np.int16).reshape(-1, 3, 2)
+    values = block[:, :, 0]
+    signs = block[:, :, 1]
+    out = dequantize(values, 0, out)
+    np.negative(out, out=out, where=signs != (values >> 15))
+    return out
+
+
+def decode_uvs(block, frac_bits=UV_FRAC_BITS, out=None):
+    return dequantize(block, frac_bits, out)
+
+
+def decode_normals(block, frac_bits=NORMALS_FRAC_BITS, out=None):
+    return dequantize(block, frac_bits, out)
+
+
+def quantize(values, frac_bits, out=None):
+    """Converts floats into saturated, rounded Qn shorts, the inverse of dequantize."""
+    values = np.asarray(values, dtype=np.float32)
+    if out is None:
+        out = np.empty(values.shape, dtype=np.int16)
+    scaled = np.rint(values * np.float32(1 << frac_bits))
+    np.clip(scaled, -0x8000, 0x7FFF, out=scaled)
+    out[...] = scaled
+    return out
+
+
+def encode_sign_split(positions, out=None):
+    """Encodes coordinates as V2/V3 (value, sign) short pairs, the inverse of decode_sign_split.
+
+    Values are rounded and saturated to shorts, sign words are FFFF for negative values and 0000 otherwise."""
+    values = quantize(positions, 0).reshape(-1, 3)
+    if out is None:
+        out = np.empty((len(values), 6), dtype=np.int16)
+    pairs = out.reshape(-1, 3, 2)
+    pairs[:, :, 0] = values
+    pairs[:, :, 1] = values >> 15
+    return out
+
+
+def quantization_error(values, frac_bits):
+    """Returns (max, rms) absolute error of storing values as saturated Qn shorts."""
+    values = np.asarray(values, dtype=np.float32)
+    if values.size == 0:
+        return 0.0, 0.0
+    error = np.abs(dequantize(quantize(values, frac_bits), frac_bits) - values)
+    return float(error.max()), float(np.sqrt(np.mean(np.square(error, dtype=np.float64))))
@@ -0,0 +1,50 @@
+# partition.py
+"""Splitting of large meshes into submeshes which fit the 16 bit index and count fields of AEM."""
+import numpy as np
+
+MAX_SUBMESH_FACES = 0xFFFF // 3  # index count is stored as ushort
+
+
+def bounding_sphere(positions):
+    """Bounding sphere (x, y, z, r) around the bounding box center, like BoundingSphere.get_bounding_sphere."""
+    positions = np.asarray(positions, dtype=np.float32)
+    if len(positions) == 0:
+        return np.zeros(4, dtype=np.float32)
+    center = (positions.min(axis=0) + positions.max(axis=0)) / 2
+    radius = np.sqrt(((positions - center) ** 2).sum(axis=1).max())
+    return np.append(center, radius).astype(np.float32)
+
+
+def morton_codes(points, bits=10):
+    """30 bit Z-order codes of points quantized to a 2^bits grid over their bounding box."""
+    points = np.asarray(points, dtype=np.float64)
+    low = points.min(axis=0)
+    extent = np.maximum(points.max(axis=0) - low, 1e-12)
+    cells = ((points - low) / extent * ((1 << bits) - 1)).astype(np.uint64)
+    codes = np.zeros(len(points), dtype=np.uint64)
+    for bit in range(bits):
+        for axis in range(3):
+            codes |= ((cells[:, axis] >> np.uint64(bit)) & np.uint64(1)) << np.uint64(3 * bit + axis)
+    return codes
+
+
+def split_submeshes(indices, channels, max_faces=MAX_SUBMESH_FACES):
+    """Splits a triangle mesh into parts of at most max_faces triangles.
+
+    Triangles are ordered along a Z-order curve through their centroids, so each
+    part is spatially compact and few vertices get duplicated on part borders.
+    Since max_faces * 3 fits 16 bits, so does the vertex count of every part.
+    channels is a list of per vertex arrays, the first one holding positions.
+    Returns a list of (channels, indices) with part local vertex numbering."""
+    indices = np.asarray(indices).reshape(-1, 3)
+    if len(indices) <= max_faces and len(channels[0]) <= 0xFFFF:
+        return [(channels, indices)]
+
+    centroids = np.asarray(channels[0], dtype=np.float64)[indices].mean(axis=1)
+    order = np.argsort(morton_codes(centroids), kind="stable")
+    parts = []
+    for start in range(0, len(order), max_faces):
+        faces = indices[order[start:start + max_faces]]
+        used, local = np.unique(faces, return_inverse=True)
+        parts.append(([np.asarray(c)[used] for c in channels], local.reshape(-1, 3)))
+    return parts
@@ -0,0 +1,115 @@
+import mmap
+import os
+import numpy as np
+
+
+class MappedReader:
+    """Read-only, file-like reader over a memory mapped file or an in-memory buffer.
+
+    read() returns memoryview slices instead of bytes, so np.frombuffer on the
+    result is a view at the file offset and nothing is copied."""
+
+    def __init__(self, source):
+        if isinstance(source, (str, os.PathLike)):
+            with open(source, "rb") as file:
+                try:
+                    source = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:  # empty files can't be mapped
+                    source = b""
+        # views handed out keep the mapping alive, it is unmapped once the last one is gone
+        self.buffer = memoryview(source).cast("B")
+        self.pos = 0
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = len(self.buffer) - self.pos
+        data = self.buffer[self.pos:self.pos + size]
+        self.pos += len(data)
+        return data
+
+    def tell(self):
+        return self.pos
+
+    def seek(self, offset, whence=os.SEEK_SET):
+        if whence == os.SEEK_CUR:
+            offset += self.pos
+        elif whence == os.SEEK_END:
+            offset += len(self.buffer)
+        self.pos = max(0, offset)
+        return self.pos
+
+    def close(self):
+        self.buffer = memoryview(b"")
+        self.pos = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return len(self.buffer)
+
+
+def read_array(file, dtype, length, tuple_size=1, endian='<'):
+    """Reads length values of dtype and reshapes them to (length // tuple_size, tuple_size).
+
+    With a MappedReader the result is a read-only view into the file."""
+    if length % tuple_size != 0:
+        raise ValueError(f"Array length must be a multiple of {tuple_size}")
+    dtype = np.dtype(dtype).newbyteorder(endian)
+    data = file.read(length * dtype.itemsize)
+    if len(data) != length * dtype.itemsize:
+        raise ValueError(f"Unexpected end of file at {file.tell()}")
+    array = np.frombuffer(data, dtype=dtype)
+    return array if tuple_size == 1 else array.reshape(-1, tuple_size)
+
+
+def read_scalar(file, dtype, endian='<'):
+    return read_array(file, dtype, 1, endian=endian)[0].item()
+
+
+def read_float(file):
+    return read_scalar(file, np.float32)
+
+def read_short(file):
+    return read_scalar(file, np.int16)
+
+def read_ushort(file):
+    return read_scalar(file, np.uint16)
+
+def read_short_array(file, length):
+    return read_array(file, np.int16, length)
+
+def read_float_array(file, length):
+    return read_array(file, np.float32, length)
+
+def read_tuples_array(file, length, tuple_size, dtype, endian='<'):
+    """Reads a flat array from a file as a (length // tuple_size, tuple_size) array."""
+    dtype_map = {'short': np.int16, 'ushort': np.uint16, 'float': np.float32}
+    return read_array(file, dtype_map[dtype], length, tuple_size, endian)
+
+def read_short_twins_array(file, length, endian='<'):
+    return read_tuples_array(file, length, 2, 'short', endian)
+
+def read_short_triplets_array(file, length, endian='<'):
+    return read_tuples_array(file, length, 3, 'short', endian)
+
+def read_ushort_triplets_array(file, length, endian='<'):
+    return read_tuples_array(file, length, 3, 'ushort', endian)
+
+def read_short_quadruplets_array(file, length, endian='<'):
+    return read_tuples_array(file, length, 4, 'short', endian)
+
+def read_short_hexlets_array(file, length, endian='<'):
+    return read_tuples_array(file, length, 6, 'short', endian)
+
+def read_float_twins_array(file, length, endian='<'):
+    return read_tuples_array(file, length, 2, 'float', endian)
+
+def read_float_triplets_array(file, length, endian='<'):
+    return read_tuples_array(file, length, 3, 'float', endian)
+
+def read_float_quadruplets_array(file, length, endian='<'):
+    return read_tuples_array(file, length, 4, 'float', endian)
@@ -0,0 +1,300 @@
+import os
+import struct
+import math
+import numpy as np
+
+TRAN_X = 1
+TRAN_Y = 2 
+TRAN_Z = 4
+TRAN_XYZ = 7
+ROT_X = 0x40
+ROT_Y = 0x80 
+ROT_Z = 0x100
+ROT_XYZ = 0x1c0
+SCALE_X = 8
+SCALE_Y = 0x10
+SCALE_Z = 0x20
+SCALE_XYZ = 0x38
+
+# keyframe records: time followed by one value or an XYZ triplet
+KEY_DTYPE = np.dtype([('t', '<f4'), ('v', '<f4')])
+KEY3_DTYPE = np.dtype([('t', '<f4'), ('v', '<f4', (3,))])
+
+
+def read_keys(file_obj, dtype):
+    """Reads a short key count and then all of its records with a single read."""
+    key_frame_cnt = max(struct.unpack('h', file_obj.read(2))[0], 0)
+    size = key_frame_cnt * dtype.itemsize
+    data = file_obj.read(size) if size else b''
+    if len(data) != size:
+        raise struct.error("unexpected end of keyframe data")
+    return np.frombuffer(data, dtype, key_frame_cnt)
+
+
+def skip_animation(file_obj, flags):
+    """Moves file_obj past an animation block using only its count fields, returns the number of keys.
+
+    Walks the layout read by Mesh.read_enhanced_data_from_file without reading
+    any key. A block cut off by the end of the file returns -1 like that
+    reader does, with file_obj left at the end of the file."""
+    start = file_obj.tell()
+    end = file_obj.seek(0, os.SEEK_END)
+    file_obj.seek(start)
+
+    def skip_keys(dtype):
+        key_frame_cnt = max(struct.unpack('h', file_obj.read(2))[0], 0)
+        if file_obj.seek(key_frame_cnt * dtype.itemsize, os.SEEK_CUR) > end:
+            raise struct.error("unexpected end of keyframe data")
+        return key_frame_cnt
+
+    keys = 0
+    try:
+        for _ in range(3):  # translation, rotation, scale
+            type_val = struct.unpack('h', file_obj.read(2))[0]
+            if type_val == 1:
+                keys += skip_keys(KEY3_DTYPE)
+            elif type_val == 0:
+                for i in range(3):
+                    keys += skip_keys(KEY_DTYPE)
+        if flags & (8 | 16):
+            if struct.unpack('h', file_obj.read(2))[0] == 2:
+                keys += skip_keys(KEY_DTYPE)
+        if flags & 16:
+            if struct.unpack('h', file_obj.read(2))[0] != 0:
+                for i in range(7):
+                    keys += skip_keys(KEY_DTYPE)
+                file_obj.seek(min(file_obj.tell() + 2, end))  # padding, the reader accepts it cut off
+    except struct.error:
+        file_obj.seek(end)
+        return -1
+    return keys
+
+
+def min_frame_spacing(times):
+    """Smallest positive key time over a list of time arrays, inf without any."""
+    spacing = float('inf')
+    for t in times:
+        positive = t[t > 0]
+        if positive.size:
+            spacing = min(spacing, float(positive.min()))
+    return spacing
+
+
+# vector channels as (XYZ key type, per axis key types in X, Y, Z column order)
+TRANSLATION = (TRAN_XYZ, (TRAN_X, TRAN_Y, TRAN_Z))
+ROTATION = (ROT_XYZ, (ROT_X, ROT_Z, ROT_Y))  # ROT_Y keys drive the Z column and ROT_Z keys the Y column
+SCALE = (SCALE_XYZ, (SCALE_X, SCALE_Y, SCALE_Z))
+
+
+def fill_gaps(values, default):
+    """Fills NaN entries of every column of values [T, N] in a linear pass.
+
+    A gap takes the last earlier value of its column, gaps before the first
+    value take the first value, and columns without any value become default."""
+    values = np.asarray(values)
+    if len(values) == 0:
+        return values.copy()
+    keyed = ~np.isnan(values)
+    rows = np.arange(len(values))[:, None]
+    source = np.maximum.accumulate(np.where(keyed, rows, -1), axis=0)
+    source = np.where(source < 0, keyed.argmax(axis=0), source)
+    filled = np.take_along_axis(values, source, axis=0)
+    filled[:, ~keyed.any(axis=0)] = default
+    return filled
+
+
+class Track:
+    """Keys of one channel: float32 times [K] and values [K] (per axis types) or [K, 3] (XYZ types)."""
+    __slots__ = ('times', 'values')
+
+    def __init__(self, times, values):
+        self.times = times
+        self.values = values
+
+    def __len__(self):
+        return len(self.times)
+
+    def __repr__(self):
+        return f"Track(times={self.times.tolist()}, values={self.values.tolist()})"
+
+
+class Transform:
+    __slots__ = ('tracks', 'timeBetweenFrames', 'max_time', 'min_time')
+
+    def __init__(self):
+        self.tracks = {}  # key type -> Track
+        self.timeBetweenFrames = 0
+        self.max_time = 0
+        self.min_time = 0
+
+    def insert_keyframes(self, values, key_type, times):
+        """Appends keys to the track of key_type, times are truncated to whole milliseconds."""
+        if len(times) == 0:
+            return
+        times = np.trunc(np.asarray(times, dtype=np.float32))
+        values = np.array(values, dtype=np.float32)  # a copy, values may be a view into the file
+        track = self.tracks.get(key_type)
+        if track is not None:
+            times = np.concatenate((track.times, times))
+            values = np.concatenate((track.values, values))
+        self.tracks[key_type] = Track(times, values)
+
+    def insert_keyframe(self, values, key_type, time):
+        values = np.asarray(values, dtype=np.float32)
+        self.insert_keyframes(values.reshape(1, 3) if values.size == 3 else values.reshape(1), key_type, [time])
+
+    def get_keyframe_count(self):
+        return sum(len(track) for track in self.tracks.values())
+
+    def timeline(self, xyz_type, axis_types):
+        """Merged view of a vector channel such as TRANSLATION, ROTATION or SCALE.
+
+        Returns (times, values): the sorted distinct key times of the channel
+        and float32 values [T, 3] with NaN where an axis has no key at that time."""
+        tracks = [self.tracks.get(key_type) for key_type in (xyz_type,) + tuple(axis_types)]
+        present = [track for track in tracks if track is not None]
+        if not present:
+            return np.empty(0, dtype=np.float32), np.empty((0, 3), dtype=np.float32)
+        times = np.unique(np.concatenate([track.times for track in present]))
+        values = np.full((len(times), 3), np.nan, dtype=np.float32)
+        xyz_track = tracks[0]
+        if xyz_track is not None:
+            values[np.searchsorted(times, xyz_track.times)] = xyz_track.values
+        for column, track in enumerate(tracks[1:]):
+            if track is not None:
+                values[np.searchsorted(times, track.times), column] = track.values
+        return times, values
+
+    def dense_timelines(self, channels):
+        """Dense view of several vector channels on their common timeline.
+
+        channels is a sequence of (channel, default), e.g. (TRANSLATION, 0).
+        Returns (times, [values]) with float32 values [T, 3] per channel, gaps
+        filled by fill_gaps."""
+        timelines = [self.timeline(*channel) for channel, _ in channels]
+        times = np.unique(np.concatenate([t for t, _ in timelines]))
+        dense = []
+        for (_, default), (channel_times, channel_values) in zip(channels, timelines):
+            values = np.full((len(times), 3), np.nan, dtype=np.float32)
+            values[np.searchsorted(times, channel_times)] = channel_values
+            dense.append(fill_gaps(values, default))
+        return times, dense
+
+    def set_animation_range_in_time(self, time_between_frames, max_time, min_time):
+        self.timeBetweenFrames = time_between_frames
+        self.max_time = max_time
+        self.min_time = min_time
+
+    def __str__(self):
+        """
+        User-friendly string representation of the Transform object
+        """
+        tracks_str = "\n".join(
+            f"  Track 0x{key_type:x}: {len(track)} keys, "
+            f"times={track.times.tolist()}, "
+            f"values={track.values.tolist()}"
+            for key_type, track in self.tracks.items()
+        ) if self.tracks else "  No keyframes"
+
+        return (f"Transform:\n"
+                f"  Number of keyframes: {self.get_keyframe_count()}\n"
+                f"  Time between frames: {self.timeBetweenFrames}\n"
+                f"  Animation range: [{self.min_time}, {self.max_time}]\n"
+                f"  Tracks:\n{tracks_str}")
+
+    def __repr__(self):
+        """
+        Detailed string representation for debugging
+        """
+        return (f"Transform(tracks={self.tracks}, "
+                f"timeBetweenFrames={self.timeBetweenFrames}, "
+                f"max_time={self.max_time}, "
+                f"min_time={self.min_time})")
+
+
+class Mesh:
+    def __init__(self):
+        self.bsphereX = 0
+        self.bsphereY = 0
+        self.bsphereZ = 0
+        self.bsphereR = 0
+        self.transform = None
+        self.field_0x85 = 0
+
+    def read_enhanced_data_from_file(self, file_obj, flags):
+        try:
+            """
+            # Read bounding sphere data (4 floats = 16 bytes)
+            sphere_data = file_obj.read(16)
+            if len(sphere_data) != 16:
+                return -1
+                
+            self.bsphereX, self.bsphereY, self.bsphereZ, self.bsphereR = struct.unpack('4f', sphere_data)
+            
+            # Rotate BSphere center
+            self.bsphereY, self.bsphereZ = self.bsphereZ, -self.bsphereY
+            """
+            transform = Transform()
+            blocks = []  # every keys array read, for the frame spacing
+
+            def read_block(dtype, key_type, scale=None):
+                keys = read_keys(file_obj, dtype)
+                blocks.append(keys['t'])
+                values = keys['v'] if scale is None else keys['v'] * scale
+                transform.insert_keyframes(values, key_type, keys['t'])
+
+            # Translation, rotation and scale: one XYZ track or one track per axis
+            axis_types = (
+                (7, (1, 4, 2), (1.0, -1.0, 1.0)),
+                (ROT_XYZ, (ROT_X, ROT_Y, ROT_Z), None),
+                (SCALE_XYZ, (SCALE_X, SCALE_Y, SCALE_Z), None),
+            )
+            for xyz_type, axis_key_types, axis_scales in axis_types:
+                type_data = file_obj.read(2)
+                if len(type_data) != 2:
+                    return -1
+                type_val = struct.unpack('h', type_data)[0]
+                if type_val == 1:
+                    read_block(KEY3_DTYPE, xyz_type)
+                elif type_val == 0:
+                    for i in range(3):
+                        read_block(KEY_DTYPE, axis_key_types[i], axis_scales[i] if axis_scales else None)
+
+            # Handle flags 8 or 16
+            if flags & (8 | 16):
+                type_val = struct.unpack('h', file_obj.read(2))[0]
+                if type_val == 2:
+                    read_block(KEY_DTYPE, 0x200)
+
+            # Handle flag 16
+            if flags & 16:
+                special_keys_present = struct.unpack('h', file_obj.read(2))[0]
+                if special_keys_present != 0:
+                    key_types = [0x400, 0x800, 0x2000, 0x4000, 0, 0, 0x40000]
+                    for i in range(7):
+                        keys = read_keys(file_obj, KEY_DTYPE)
+                        blocks.append(keys['t'])
+                        values = keys['v'].astype(np.float64) / 100.0
+                        if i == 6:
+                            values = (values * math.pi) / 180.0
+                        transform.insert_keyframes(values, key_types[i], keys['t'])
+                        if len(keys):
+                            self.field_0x85 = 1
+                    padding = file_obj.read(2)
+                    if padding != b'\x00\x00':
+                        print("UNEXPECTED BYTES %s  @ %d" % (padding.hex() ,file_obj.tell()-2))
+
+            if transform.get_keyframe_count() < 1:
+                return -1
+            else:
+                self.transform = transform
+                spacing = min_frame_spacing(blocks)
+                # keys only at time 0 leave no spacing, one key per second is assumed
+                transform.timeBetweenFrames = 1000 if math.isinf(spacing) else int(spacing)
+                transform.set_animation_range_in_time(
+                    transform.timeBetweenFrames, 10000000, 0
+                )
+                return 1
+
+        except (struct.error, IOError):
+            return -1
@@ -0,0 +1,100 @@
+# strips.py
+"""Triangle strip handling for V1 meshes."""
+import numpy as np
+
+
+def unpack_strips(indices, strip_lengths, drop_degenerate=True):
+    """Unpacks triangle strips into an (F, 3) triangle list.
+
+    indices is the flat index buffer and strip_lengths the number of indices
+    used by each strip. Every odd triangle of a strip has its winding flipped.
+    Degenerate triangles (two equal corners, used to stitch strips) are dropped
+    unless drop_degenerate is False. Raises IndexError when the strips reach
+    past the end of the index buffer."""
+    indices = np.asarray(indices)
+    strip_lengths = np.asarray(strip_lengths, dtype=np.int64)
+    dtype = np.uint16 if indices.dtype.itemsize <= 2 else np.uint32
+
+    starts = np.cumsum(strip_lengths) - strip_lengths
+    tri_counts = np.maximum(strip_lengths - 2, 0)
+    tri_num = int(tri_counts.sum())
+    if tri_num == 0:
+        return np.empty((0, 3), dtype=dtype)
+
+    # position of every triangle inside its strip and its first index in the buffer
+    strip_of_tri = np.repeat(np.arange(len(strip_lengths)), tri_counts)
+    j = np.arange(tri_num) - np.repeat(np.cumsum(tri_counts) - tri_counts, tri_counts)
+    first = starts[strip_of_tri] + j
+    if first.min() < 0 or first.max() + 2 >= len(indices):
+        raise IndexError("Triangle strips reach past the index buffer")
+
+    corners = first[:, None] + np.array([0, 1, 2])
+    odd = (j & 1).astype(bool)
+    corners[odd] = corners[odd][:, [0, 2, 1]]
+    faces = indices[corners].astype(dtype, copy=False)
+
+    if drop_degenerate:
+        a, b, c = faces[:, 0], faces[:, 1], faces[:, 2]
+        faces = faces[(a != b) & (b != c) & (a != c)]
+    return faces
+
+
+MAX_STRIP_LENGTH = 0x7FFF  # strip lengths are stored as int16
+
+
+def stripify(indices):
+    """Greedily converts an (F, 3) triangle list into triangle strips.
+
+    A strip is extended through the edge shared with the next unused
+    triangle. When it can't be, a swap is tried: repeating the last vertex and
+    the one two back turns the strip around its other edge at the cost of two
+    degenerate triangles. Only when that fails as well, or the strip reached
+    MAX_STRIP_LENGTH, a new strip is started.
+    Returns (strip_indices, strip_lengths) in the layout unpack_strips reads."""
+    indices = np.asarray(indices).reshape(-1, 3)
+    tris = indices.tolist()
+    # directed edge -> triangle which has it in its winding order
+    edge_tri = {}
+    for t, (a, b, c) in enumerate(tris):
+        edge_tri[(a, b)] = t
+        edge_tri[(b, c)] = t
+        edge_tri[(c, a)] = t
+    used = bytearray(len(tris))
+
+    def next_tri(s):
+        # triangle j of a strip is (s[j], s[j+1], s[j+2]) for even j and (s[j], s[j+2], s[j+1]) for odd j
+        if (len(s) - 2) % 2 == 0:
+            t = edge_tri.get((s[-2], s[-1]))
+        else:
+            t = edge_tri.get((s[-1], s[-2]))
+        if t is None or used[t]:
+            return None
+        return t
+
+    strip_indices = []
+    strip_lengths = []
+    for start in range(len(tris)):
+        if used[start]:
+            continue
+        used[start] = 1
+        a, b, c = tris[start]
+        s = [a, b, c]
+        for rotation in ([b, c, a], [c, a, b]):
+            if next_tri(s) is not None:
+                break
+            if next_tri(rotation) is not None:
+                s = rotation
+                break
+        while len(s) + 3 <= MAX_STRIP_LENGTH:
+            t = next_tri(s)
+            if t is None:
+                swapped = s + [s[-1], s[-3]]
+                t = next_tri(swapped)
+                if t is None:
+                    break
+                s = swapped
+            used[t] = 1
+            s.append(sum(tris[t]) - s[-1] - s[-2])
+        strip_indices.extend(s)
+        strip_lengths.append(len(s))
+    return np.array(strip_indices, dtype=indices.dtype), np.array(strip_lengths, dtype=np.int16)
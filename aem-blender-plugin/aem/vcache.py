@@ -0,0 +1,109 @@
+# vcache.py
+"""Post-transform vertex cache and vertex fetch optimization of triangle lists.
+
+Triangles are reordered with Tipsy (Sander, Nehab, Barczak: "Fast Triangle
+Reordering for Vertex Locality and Reduced Overdraw", 2007), which runs in
+linear time, and vertices are then renumbered in order of first use."""
+import numpy as np
+
+CACHE_SIZE = 16
+
+
+def cache_misses(indices, cache_size=CACHE_SIZE):
+    """Number of vertex transforms of a FIFO post-transform cache drawing indices."""
+    flat = np.asarray(indices).ravel().tolist()
+    stamps = {}
+    time = 0
+    for v in flat:
+        if time - stamps.get(v, -cache_size) >= cache_size:
+            stamps[v] = time
+            time += 1
+    return time
+
+
+def cache_stats(indices, cache_size=CACHE_SIZE):
+    """Returns (ACMR, ATVR): transforms per triangle and transforms per referenced vertex."""
+    indices = np.asarray(indices).reshape(-1, 3)
+    if len(indices) == 0:
+        return 0.0, 0.0
+    misses = cache_misses(indices, cache_size)
+    return misses / len(indices), misses / len(np.unique(indices))
+
+
+def tipsify(indices, vertex_count, cache_size=CACHE_SIZE):
+    """Reorders triangles for cache locality, returns the reordered (F, 3) index array."""
+    indices = np.asarray(indices).reshape(-1, 3)
+    if indices.size == 0:
+        return indices
+    flat = indices.ravel()
+    # vertex -> triangles adjacency in CSR form
+    counts = np.bincount(flat, minlength=vertex_count)
+    offsets = np.concatenate(([0], np.cumsum(counts))).tolist()
+    adjacency = (np.argsort(flat, kind="stable") // 3).tolist()
+    tris = indices.tolist()
+    live = counts.tolist()
+
+    stamps = [-cache_size - 1] * vertex_count
+    emitted = bytearray(len(tris))
+    dead_end = []
+    output = []
+    time = cache_size + 1
+    cursor = 0
+    fan = 0
+    while fan >= 0:
+        candidates = []
+        for t in adjacency[offsets[fan]:offsets[fan + 1]]:
+            if emitted[t]:
+                continue
+            emitted[t] = 1
+            output.append(t)
+            for v in tris[t]:
+                dead_end.append(v)
+                candidates.append(v)
+                live[v] -= 1
+                if time - stamps[v] > cache_size:
+                    stamps[v] = time
+                    time += 1
+
+        # next fanning vertex: the candidate which stays in cache longest after its fan is drawn
+        fan = -1
+        best = -1
+        for v in candidates:
+            if live[v] > 0:
+                priority = 0
+                if time - stamps[v] + 2 * live[v] <= cache_size:
+                    priority = time - stamps[v]
+                if priority > best:
+                    best = priority
+                    fan = v
+        if fan == -1:
+            while dead_end:
+                v = dead_end.pop()
+                if live[v] > 0:
+                    fan = v
+                    break
+        if fan == -1:
+            while cursor < vertex_count:
+                if live[cursor] > 0:
+                    fan = cursor
+                    break
+                cursor += 1
+    return indices[output]
+
+
+def reorder_vertices(indices, channels):
+    """Renumbers vertices in order of first use in indices, dropping unused ones.
+
+    channels is a list of per vertex arrays. Returns (channels, indices)."""
+    flat = np.asarray(indices).ravel()
+    used, first = np.unique(flat, return_index=True)
+    order = used[np.argsort(first)]
+    remap = np.zeros(len(channels[0]), dtype=np.int64)
+    remap[order] = np.arange(len(order))
+    return [np.asarray(c)[order] for c in channels], remap[np.asarray(indices)]
+
+
+def optimize(indices, channels, cache_size=CACHE_SIZE):
+    """Tipsy triangle reordering followed by vertex fetch reordering, returns (channels, indices)."""
+    indices = tipsify(indices, len(channels[0]), cache_size)
+    return reorder_vertices(indices, channels)
@@ -0,0 +1,59 @@
+# weld.py
+"""Vertex welding and deduplication on NumPy arrays, used by the importer and the exporter."""
+import numpy as np
+
+
+def unique_rows(keys):
+    """np.unique over rows of a 2D integer array, returning (first_index, inverse).
+
+    Rows are compared as raw bytes, which is much faster than np.unique(axis=0).
+    Unique rows are numbered in order of their first occurrence."""
+    keys = np.ascontiguousarray(keys)
+    rows = keys.view(np.dtype((np.void, keys.dtype.itemsize * keys.shape[1]))).ravel()
+    _, first, inverse = np.unique(rows, return_index=True, return_inverse=True)
+    order = np.argsort(first, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    return first[order], rank[inverse.ravel()]
+
+
+def weld_vertices(positions, threshold=0.0001, normals=None):
+    """Merges vertices which fall into the same cell of a threshold sized grid.
+
+    When normals are given they are part of the key, so vertices on sharp
+    edges are kept apart. Returns (keep, remap): indices of the kept vertices
+    and the old -> new vertex index map."""
+    positions = np.asarray(positions)
+    keys = np.rint(positions / threshold).astype(np.int64)
+    if normals is not None:
+        keys = np.hstack((keys, np.rint(np.asarray(normals) / threshold).astype(np.int64)))
+    return unique_rows(keys)
+
+
+def weld_mesh(positions, indices, threshold=0.0001, normals=None):
+    """Welds a triangle mesh, dropping triangles collapsed by the merge.
+
+    Returns (positions, faces, loop_vertices) where loop_vertices holds the
+    original vertex of every face corner, for looking up per vertex UVs and
+    normals of the unwelded mesh."""
+    keep, remap = weld_vertices(positions, threshold, normals)
+    indices = np.asarray(indices)
+    faces = remap[indices]
+    valid = (faces[:, 0] != faces[:, 1]) & (faces[:, 1] != faces[:, 2]) & (faces[:, 0] != faces[:, 2])
+    return np.asarray(positions)[keep], faces[valid], indices[valid].ravel()
+
+
+def deduplicate(indices, channels, decimals=6):
+    """Merges face corners which share every channel value at the given precision.
+
+    channels is a list of per vertex arrays (e.g. positions, uvs, normals).
+    Their rows are rounded to decimals, packed into one record per vertex and
+    deduplicated with np.unique. Returns (channels, indices) with the compact
+    vertex arrays and the remapped index buffer."""
+    indices = np.asarray(indices)
+    if len(channels[0]) == 0:
+        return [np.asarray(c)[:0] for c in channels], np.zeros(indices.shape, dtype=np.int64)
+    scale = 10.0 ** decimals
+    keys = np.hstack([np.rint(np.asarray(c, dtype=np.float64).reshape(len(c), -1) * scale).astype(np.int64) for c in channels])
+    keep, remap = unique_rows(keys)
+    return [np.asarray(c)[keep] for c in channels], remap[indices]
@@ -1,124 +1,89 @@
 # exporter.py
-import bpy, os
+import bpy, os, time
 from bpy_extras.io_utils import ExportHelper
-from bpy.props import StringProperty, FloatProperty, BoolProperty, EnumProperty
+from bpy.props import StringProperty, FloatProperty, BoolProperty, EnumProperty, IntProperty
 from bpy.types import Operator
-from struct import pack
 import bmesh
-
-from . import common
-
-VERSION = {
-    1: b"AEMesh\x00",
-    2: b"V2AEMesh\x00",
-    3: b"V3AEMesh\x00",
-    4: b"V4AEMesh\x00",
-    5: b"V5AEMesh\x00"
+import numpy as np
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from .aem import common
+from .aem.aem_pack import pack_aem
+
+EXPORT_VERSIONS = {
+    "AEMesh": 1,
+    "V2AEMesh": 2,
+    "V3AEMesh": 3,
+    "V4AEMesh": 4,
+    "V5AEMesh": 5,
+    "AUTO": None,  # smallest version within the quantization tolerance
 }
 
-               
-def export_aem(mesh, file_path, aem_version, triangulate_method, SCALE):
-   
-    with open(file_path, 'wb') as file_aem:
-        magic = VERSION[4]
-        pivot = pack("<bH3f", 0x17, 1,*(0,0,0))
-        header = magic + pivot
-        file_aem.write(header)
-               
-        obj = bpy.context.active_object
-        if obj is None or obj.type != 'MESH':
-            print("Please select a mesh object")
-            return
-        mesh = obj.data
-        bm = bmesh.new()
-        bm.from_mesh(mesh)
-        bmesh.ops.triangulate(bm, faces=bm.faces)
-        me = mesh.copy()
-        bm.to_mesh(me)
-        bm.free()
-        del bm
-        
-        """
-        uv_layer = None
-        if bm.loops.layers.uv:
-            uv_layer = bm.loops.layers.uv.active
-       
-        for face in bm.faces:
-            next_face = []
-            
-            for loop in face.loops:
-                x, y, z = loop.vert.co
-                
-                u, v = (0, 0)
-                if uv_layer:
-                    u, v = loop[uv_layer].uv
-
-                nx, ny, nz = loop.vert.normal
-        """
-    
-        vertices = me.vertices
-        uv_layer = None        
-        if len(me.uv_layers) > 0:
-            uv_layer = me.uv_layers.active.data[:]        
-        loops = me.loops
-        polygons = me.polygons
-        unique_v_buffer = {} # Maps unique vertex data to index
-        f_buffer = []
-        v_buffer = []
-        vi = 0
-
-        for polygon in polygons:
-            next_face = [] # 3 v, 3 vn, 2 vt
-            for li in polygon.loop_indices:
-                # append vertex
-                vid = loops[li].vertex_index
-                x, y, z  = vertices[vid].co
-                loops[li].vertex_index
-
-                # append uv
-                u, v = (0, 0)
-                if uv_layer:
-                    u, v = uv_layer[li].uv
-
-                # append normal
-                nx, ny, nz = loops[li].normal
-                
-                unique_v = (
-                    round(x, 6), round(z, 6), round(-y, 6),
-                    round(u, 6), round(v, 6),
-                    round(nx, 6), round(nz, 6), round(-ny, 6)
-                )
-                '''
-                if unique_v not in unique_v_buffer:
-                    unique_v_buffer[unique_v] = vi
-                    fv = vi
-                    vi += 1
-                else:
-                    fv = unique_v_buffer[unique_v]'''
-                v_buffer += [unique_v]
-                fv = vi
-                vi += 1
-                
-                next_face.append(fv)
-            
-            f_buffer.append(next_face)
-        bpy.data.meshes.remove(me)
-
-        fi_num = len(f_buffer)*3   
-        file_aem.write(pack("H", fi_num))         
-        file_aem.write(pack(f"{fi_num}H", *(i for sub in f_buffer for i in sub)))
-        v_num = len(v_buffer)
-        file_aem.write(pack("H", v_num))
-        file_aem.write(pack(f"{v_num*3}f", *(v for ver in v_buffer for v in ver[:3])))
-        file_aem.write(pack(f"{v_num*2}f", *(t for ver in v_buffer for t in ver[3:5])))
-        file_aem.write(pack(f"{v_num*3}f", *(n for ver in v_buffer for n in ver[5:])))
-
-
-        bsphere = pack("4f", *(0,0,0,1000))
-        animation = pack("7H", *(1,0,1,0,1,0,0))
-        file_aem.write(bsphere + animation)
-
 
+def triangulate(mesh):
+    """Triangulates mesh in place, AEM does't support quads nor higher n-gons."""
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+    bmesh.ops.triangulate(bm, faces=bm.faces)
+    bm.to_mesh(mesh)
+    bm.free()
+
+
+def mesh_corner_arrays(me):
+    """Gathers per face corner positions, UVs and normals of a triangulated mesh with foreach_get.
+
+    Coordinates are converted to AEM axes (x, z, -y) and rounded to 6 decimals.
+    Returns (positions, uvs, normals, indices), one vertex per face corner."""
+    v_co = np.empty(len(me.vertices) * 3, dtype=np.float32)
+    me.vertices.foreach_get("co", v_co)
+    loop_vertices = np.empty(len(me.loops), dtype=np.int32)
+    me.loops.foreach_get("vertex_index", loop_vertices)
+    loop_normals = np.empty(len(me.loops) * 3, dtype=np.float32)
+    me.loops.foreach_get("normal", loop_normals)
+    loop_uvs = np.zeros(len(me.loops) * 2, dtype=np.float32)
+    if len(me.uv_layers) > 0:
+        me.uv_layers.active.data.foreach_get("uv", loop_uvs)
+
+    # corners in polygon order, every polygon is a triangle
+    loop_starts = np.empty(len(me.polygons), dtype=np.int32)
+    me.polygons.foreach_get("loop_start", loop_starts)
+    corners = (loop_starts[:, None] + np.arange(3)).ravel()
+
+    positions = v_co.reshape(-1, 3)[loop_vertices[corners]][:, [0, 2, 1]]
+    positions[:, 2] *= -1
+    normals = loop_normals.reshape(-1, 3)[corners][:, [0, 2, 1]]
+    normals[:, 2] *= -1
+    uvs = loop_uvs.reshape(-1, 2)[corners]
+    indices = np.arange(len(corners), dtype=np.uint32).reshape(-1, 3)
+    return positions.round(6), uvs.round(6), normals.round(6), indices
+
+
+def extract_mesh(mesh):
+    """Main thread part of the export: triangulates mesh in place and gathers its corner arrays.
+
+    mesh should be a temporary mesh, e.g. from Object.to_mesh."""
+    triangulate(mesh)
+    return mesh_corner_arrays(mesh)
+
+
+def extract_object(obj, depsgraph):
+    """Corner arrays of obj with its modifiers applied, through a temporary evaluated mesh."""
+    obj_eval = obj.evaluated_get(depsgraph)
+    try:
+        return extract_mesh(obj_eval.to_mesh())
+    finally:
+        obj_eval.to_mesh_clear()
+
+
+def export_aem(mesh, file_path, aem_version, triangulate_method, SCALE, dedup=True, precision=6, optimize_cache=False, tolerance=0.01):
+    """Writes mesh to file_path, returns a dict of export statistics."""
+    me = mesh.copy()
+    try:
+        arrays = extract_mesh(me)
+    finally:
+        bpy.data.meshes.remove(me)
+    return pack_aem(arrays, file_path, aem_version, dedup, precision, optimize_cache, tolerance)
 
 
 class ExportAEM(Operator, ExportHelper):
@@ -139,8 +104,12 @@ class ExportAEM(Operator, ExportHelper):
         name="AEM version",
         description="Choose exported AEM's version.",
         items=[
-            ("V2AEMesh", "V2AEMesh", "Export V2AEMesh"),
-            ("V5AEMesh", "V5AEMesh", "Export V5AEMesh")
+            ("AEMesh", "AEMesh", "Export V1 AEMesh with triangle strips"),
+            ("V2AEMesh", "V2AEMesh", "Export V2AEMesh with quantized positions, UVs and normals"),
+            ("V3AEMesh", "V3AEMesh", "Export V3AEMesh with quantized positions, UVs and normals"),
+            ("V4AEMesh", "V4AEMesh", "Export V4AEMesh"),
+            ("V5AEMesh", "V5AEMesh", "Export V5AEMesh"),
+            ("AUTO", "Smallest", "Export the smallest of V2, V3 and V5 which stays within the quantization tolerance")
         ],
         default='V5AEMesh'
     )
@@ -179,6 +148,33 @@ class ExportAEM(Operator, ExportHelper):
     )
     
 
+    dedup: BoolProperty(
+        name="Merge Duplicate Vertices",
+        description="Share vertices between faces when position, UV and normal are equal",
+        default=True
+    )
+
+    precision: IntProperty(
+        name="Merge Precision",
+        description="Number of decimals compared when merging duplicate vertices",
+        default=6,
+        min=0, max=8
+    )
+
+    optimize_cache: BoolProperty(
+        name="Optimize Vertex Cache",
+        description="Reorder triangles and vertices for the post-transform vertex cache (slower export)",
+        default=False
+    )
+
+    tolerance: FloatProperty(
+        name="Quantization Tolerance",
+        description="Largest quantization error accepted by the Smallest version choice, in file units",
+        default=0.01,
+        min=0.0, max=1.0,
+        precision=4
+    )
+
     overwrite: BoolProperty(
         name="Overwrite",
         description="Overwrite existing files",
@@ -198,41 +194,53 @@ class ExportAEM(Operator, ExportHelper):
             self.report({'ERROR'}, "No objects selected")
             return {'CANCELLED'}
             
-        for obj in bpy.context.selected_objects:
-            if not obj.data or not isinstance(obj.data, bpy.types.Mesh) or obj.type != 'MESH':
-                self.report({'ERROR'}, f"Object {obj.name} does not have a mesh")
-                continue
-
-            if len(context.selected_objects) == 1:
-                file_out = os.path.join(directory, self.add_prefix + os.path.splitext(os.path.basename(self.filepath))[0] + self.add_suffix + '.aem')
-            else:
-                file_out = os.path.join(directory, self.add_prefix + obj.name + self.add_suffix + '.aem')
-            
-            if ( (self.overwrite and os.path.exists(file_out) ) or (not os.path.exists(file_out)) ):
-            
-                mesh = obj.data.copy()
-                
-                #bpy.context.collection.objects.link(bpy.data.objects.new("aem_temp", mesh))
-                #bpy.context.view_layer.objects.active = bpy.context.collection.objects['aem_temp']
-            
-                #AEM does't support quads nor higher n-gons
-                '''bpy.ops.object.modifier_add(type='TRIANGULATE')
-                bpy.context.object.modifiers["Triangulate"].quad_method = self.triangulate_method
-                bpy.context.object.modifiers["Triangulate"].min_vertices = 4
-                if self.triangulate_method == 'BEAUTY':
-                    bpy.context.object.modifiers["Triangulate"].ngon_method = 'BEAUTY'
+        depsgraph = context.evaluated_depsgraph_get()
+        workers = max(1, min(len(context.selected_objects), os.cpu_count() or 1))
+        # extract arrays on the main thread, pack and write them in worker processes: stripify,
+        # tipsify and the other packing stages are Python loops which would hold the GIL in threads.
+        # Spawned workers run Blender's bundled Python, which imports the addon without bpy.
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            jobs = []
+            for obj in bpy.context.selected_objects:
+                if not obj.data or not isinstance(obj.data, bpy.types.Mesh) or obj.type != 'MESH':
+                    self.report({'ERROR'}, f"Object {obj.name} does not have a mesh")
+                    continue
+
+                if len(context.selected_objects) == 1:
+                    file_out = os.path.join(directory, self.add_prefix + os.path.splitext(os.path.basename(self.filepath))[0] + self.add_suffix + '.aem')
                 else:
-                    bpy.context.object.modifiers["Triangulate"].ngon_method = 'CLIP'       
-                bpy.ops.object.modifier_apply(modifier="Triangulate")
-                
-                '''
-                #self.prepare_mesh(mesh, self.triangulate_method)
-                
-                export_aem(mesh, self.filepath.replace(".aem", f"_{obj.name}.aem"), 4, self.triangulate_method, self.scale)
-                bpy.data.meshes.remove(mesh)
-            else:
-                self.report({'WARNING'}, f"File {file_out} already exists and overwrite is disabled.")
-    
+                    file_out = os.path.join(directory, self.add_prefix + obj.name + self.add_suffix + '.aem')
+
+                if not self.overwrite and os.path.exists(file_out):
+                    self.report({'WARNING'}, f"File {file_out} already exists and overwrite is disabled.")
+                    continue
+
+                start = time.perf_counter()
+                arrays = extract_object(obj, depsgraph)
+                extract_time = time.perf_counter() - start
+                future = pool.submit(
+                    pack_aem, arrays, file_out, EXPORT_VERSIONS[self.aem_version],
+                    self.dedup, self.precision, self.optimize_cache, self.tolerance
+                )
+                jobs.append((obj.name, extract_time, future))
+
+            # report in selection order
+            for name, extract_time, future in jobs:
+                try:
+                    stats = future.result()
+                except Exception as e:  # one bad object must not abort the others
+                    self.report({'ERROR'}, f"{name}: {type(e).__name__}: {e}")
+                    continue
+                self.report({'INFO'}, f"{name}: {stats['vertices_before']} -> {stats['vertices_after']} vertices, {stats['submeshes']} submesh(es)")
+                if self.optimize_cache:
+                    self.report({'INFO'}, f"{name}: ACMR {stats['acmr_before']:.3f} -> {stats['acmr_after']:.3f}, ATVR {stats['atvr_before']:.3f} -> {stats['atvr_after']:.3f}")
+                if "errors" in stats:
+                    errors = ", ".join(f"{channel} max {max_error:.6f} rms {rms_error:.6f}" for channel, (max_error, rms_error) in stats["errors"].items())
+                    self.report({'INFO'}, f"{name}: V{stats['version']} quantization error: {errors}")
+                if "indices_written" in stats:
+                    self.report({'INFO'}, f"{name}: triangle strips {stats['indices_list']} -> {stats['indices_written']} indices")
+                self.report({'INFO'}, f"{name}: extract {extract_time * 1000:.1f} ms, pack and write {stats['pack_time'] * 1000:.1f} ms")
+
         return {'FINISHED'}
 
 
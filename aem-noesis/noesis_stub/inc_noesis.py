@@ -0,0 +1,325 @@
+# inc_noesis.py
+"""Stand-in for Noesis' inc_noesis module, for running and benchmarking fmt_aem without Noesis.
+
+Only the part of the API used by fmt_aem is covered. rapi geometry calls
+record the bound buffers as NumPy arrays and rpgConstructModel turns every
+commit into a NoeMesh holding them. Don't copy this file into Noesis'
+plugins/python folder, it would shadow the real module."""
+import struct
+import types
+import numpy as np
+
+__all__ = [
+    "noesis", "rapi", "noePack", "noeUnpack", "NoeVec3", "NoeAngles", "NoeMat43", "NoeBone", "NoeTexture",
+    "NoeMaterial", "NoeModelMaterials", "NoeVertWeight", "NoeMesh", "NoeKeyFramedValue", "NoeKeyFramedBone",
+    "NoeKeyFramedAnim", "NoeModel", "NoeBitStream",
+]
+
+noesis = types.ModuleType("noesis")
+noesis.RPGEODATA_FLOAT = 0
+noesis.RPGEODATA_INT = 1
+noesis.RPGEODATA_UINT = 2
+noesis.RPGEODATA_SHORT = 3
+noesis.RPGEODATA_USHORT = 4
+noesis.RPGEODATA_HALFFLOAT = 5
+noesis.RPGEODATA_DOUBLE = 6
+noesis.RPGEODATA_BYTE = 7
+noesis.RPGEODATA_UBYTE = 8
+noesis.RPGEO_TRIANGLE = 3
+noesis.NOESISTEX_RGBA32 = 0
+noesis.NOEKF_TRANSLATION_VECTOR_3 = 0
+noesis.NOEKF_ROTATION_EULER_XYZ_3 = 1
+noesis.NOEKF_SCALE_VECTOR_3 = 2
+noesis.NMSHAREDFL_FLATWEIGHTS = 1
+noesis.NMSHAREDFL_FLATWEIGHTS_FORCE4 = 2
+noesis.NOESEEK_ABS = 0
+noesis.NOESEEK_REL = 1
+
+DATA_TYPES = {
+    noesis.RPGEODATA_FLOAT: "<f4",
+    noesis.RPGEODATA_INT: "<i4",
+    noesis.RPGEODATA_UINT: "<u4",
+    noesis.RPGEODATA_SHORT: "<i2",
+    noesis.RPGEODATA_USHORT: "<u2",
+    noesis.RPGEODATA_HALFFLOAT: "<f2",
+    noesis.RPGEODATA_DOUBLE: "<f8",
+    noesis.RPGEODATA_BYTE: "i1",
+    noesis.RPGEODATA_UBYTE: "u1",
+}
+
+handlers = []
+
+
+def register(name, ext):
+    handlers.append({"name": name, "ext": ext})
+    return len(handlers) - 1
+
+
+def set_handler(key):
+    def setter(handle, value):
+        handlers[handle][key] = value
+    return setter
+
+
+noesis.register = register
+noesis.setHandlerTypeCheck = set_handler("check")
+noesis.setHandlerLoadModel = set_handler("load")
+noesis.setHandlerWriteModel = set_handler("write_model")
+noesis.setHandlerWriteAnim = set_handler("write_anim")
+noesis.setTypeSharedModelFlags = set_handler("flags")
+noesis.logPopup = lambda: None
+
+
+def bound_array(data, data_type, stride):
+    dtype = np.dtype(DATA_TYPES[data_type])
+    return np.frombuffer(data, dtype).reshape(-1, stride // dtype.itemsize)
+
+
+class RpgContext:
+    def __init__(self):
+        self.meshes = []
+        self.name = ""
+        self.material = ""
+        self.deferred_anims = []
+        self.clear()
+
+    def clear(self):
+        self.binds = {}
+
+
+rapi = types.ModuleType("rapi")
+rapi.context = RpgContext()
+
+
+def rpg_create_context():
+    rapi.context = RpgContext()
+    return rapi.context
+
+
+def rpg_bind(key):
+    def bind(data, data_type, stride, *args):
+        rapi.context.binds[key] = bound_array(data, data_type, stride)
+    return bind
+
+
+def rpg_commit_triangles(data, data_type, count, prim_type, use_plot_map=0):
+    context = rapi.context
+    indices = np.frombuffer(data, DATA_TYPES[data_type], count)
+    mesh = NoeMesh(indices, context.binds.get("positions"), context.name, context.material)
+    mesh.normals = context.binds.get("normals")
+    mesh.uvs = context.binds.get("uvs")
+    mesh.weightIdx = context.binds.get("bone_indices")
+    mesh.weightVal = context.binds.get("bone_weights")
+    context.meshes.append(mesh)
+
+
+def rpg_set_name(name):
+    rapi.context.name = name
+
+
+def rpg_set_material(name):
+    rapi.context.material = name
+
+
+rapi.rpgCreateContext = rpg_create_context
+rapi.rpgSetName = rpg_set_name
+rapi.rpgSetMaterial = rpg_set_material
+rapi.rpgBindPositionBuffer = rpg_bind("positions")
+rapi.rpgBindNormalBuffer = rpg_bind("normals")
+rapi.rpgBindUV1Buffer = rpg_bind("uvs")
+rapi.rpgBindBoneIndexBuffer = rpg_bind("bone_indices")
+rapi.rpgBindBoneWeightBuffer = rpg_bind("bone_weights")
+rapi.rpgCommitTriangles = rpg_commit_triangles
+rapi.rpgClearBufferBinds = lambda: rapi.context.clear()
+rapi.rpgConstructModel = lambda: NoeModel(list(rapi.context.meshes))
+rapi.getDeferredAnims = lambda: rapi.context.deferred_anims
+rapi.setDeferredAnims = lambda anims: setattr(rapi.context, "deferred_anims", anims)
+rapi.isGeometryTarget = lambda: 1
+
+noePack = struct.pack
+noeUnpack = struct.unpack
+
+
+class NoeVec3(list):
+    def __init__(self, values=(0.0, 0.0, 0.0)):
+        super().__init__(values)
+
+    def toBytes(self):
+        return struct.pack("<3f", *self)
+
+
+class NoeAngles(NoeVec3):
+    pass
+
+
+class NoeMat43:
+    def __init__(self, rows=((1, 0, 0), (0, 1, 0), (0, 0, 1), (0, 0, 0))):
+        self.rows = [NoeVec3(r) for r in rows]
+
+    def toBytes(self):
+        return b"".join(r.toBytes() for r in self.rows)
+
+
+class NoeBone:
+    def __init__(self, index, name, matrix, parentName=None, parentIndex=-1):
+        self.index = index
+        self.name = name
+        self.setMatrix(matrix)
+        self.parentName = parentName
+        self.parentIndex = parentIndex
+
+    def setMatrix(self, matrix):
+        self.matrix = matrix
+
+
+class NoeTexture:
+    def __init__(self, name, width, height, pixelData, pixelType):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.pixelData = pixelData
+        self.pixelType = pixelType
+
+
+class NoeMaterial:
+    def __init__(self, name, texName):
+        self.name = name
+        self.texName = texName
+
+
+class NoeModelMaterials:
+    def __init__(self, texList, matList):
+        self.texList = texList
+        self.matList = matList
+
+
+class NoeVertWeight:
+    def __init__(self, indices, weights):
+        self.indices = indices
+        self.weights = weights
+
+
+class NoeMesh:
+    def __init__(self, indices, positions, name="", matName=""):
+        self.indices = indices
+        self.positions = positions
+        self.name = name
+        self.matName = matName
+        self.normals = []
+        self.uvs = []
+        self.weights = []
+
+    def setNormals(self, normals):
+        self.normals = normals
+
+    def setUVs(self, uvs):
+        self.uvs = uvs
+
+    def setWeights(self, weights):
+        self.weights = weights
+
+    def setMaterial(self, matName):
+        self.matName = matName
+
+
+class NoeKeyFramedValue:
+    def __init__(self, time, value):
+        self.time = time
+        self.value = value
+
+
+class NoeKeyFramedBone:
+    def __init__(self, boneIndex):
+        self.boneIndex = boneIndex
+        self.translationKeys = []
+        self.rotationKeys = []
+        self.scaleKeys = []
+
+    def setTranslation(self, keys, keyType=0, interpolation=0):
+        self.translationKeys = keys
+
+    def setRotation(self, keys, keyType=0, interpolation=0):
+        self.rotationKeys = keys
+
+    def setScale(self, keys, keyType=0, interpolation=0):
+        self.scaleKeys = keys
+
+    def hasAnyKeys(self):
+        return bool(self.translationKeys or self.rotationKeys or self.scaleKeys)
+
+
+class NoeKeyFramedAnim:
+    def __init__(self, name, bones, kfBones, frameRate=20.0, flags=0):
+        self.name = name
+        self.bones = bones
+        self.kfBones = kfBones
+        self.frameRate = frameRate
+        self.flags = flags
+
+
+class NoeModel:
+    def __init__(self, meshes=None, bones=None, anims=None):
+        self.meshes = meshes or []
+        self.bones = bones or []
+        self.anims = anims or []
+        self.modelMats = None
+
+    def setBones(self, bones):
+        self.bones = bones
+
+    def setAnims(self, anims):
+        self.anims = anims
+
+    def setModelMaterials(self, modelMats):
+        self.modelMats = modelMats
+
+
+class NoeBitStream:
+    def __init__(self, data=b""):
+        self.data = bytes(data)
+        self.offset = 0
+
+    def getSize(self):
+        return len(self.data)
+
+    def getBuffer(self):
+        return self.data
+
+    def tell(self):
+        return self.offset
+
+    def seek(self, offset, whence=noesis.NOESEEK_ABS):
+        self.offset = offset if whence == noesis.NOESEEK_ABS else self.offset + offset
+        return 0
+
+    def checkEOF(self):
+        return self.offset >= len(self.data)
+
+    def readBytes(self, size):
+        data = self.data[self.offset:self.offset + size]
+        self.offset += len(data)
+        return data
+
+    def unpack(self, fmt):
+        size = struct.calcsize(fmt)
+        value = struct.unpack(fmt, self.data[self.offset:self.offset + size])[0]
+        self.offset += size
+        return value
+
+    def readUByte(self):
+        return self.unpack("<B")
+
+    def readShort(self):
+        return self.unpack("<h")
+
+    def readUShort(self):
+        return self.unpack("<H")
+
+    def readInt(self):
+        return self.unpack("<i")
+
+    def readFloat(self):
+        return self.unpack("<f")
+
+    def close(self):
+        pass
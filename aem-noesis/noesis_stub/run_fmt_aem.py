@@ -0,0 +1,46 @@
+# run_fmt_aem.py
+"""Loads .aem files through fmt_aem with the inc_noesis stand-in and prints decode and load timings.
+
+    python aem-noesis/noesis_stub/run_fmt_aem.py FILE [FILE ...]"""
+import contextlib
+import io
+import os
+import sys
+import time
+
+here = os.path.dirname(os.path.abspath(__file__))
+sys.path[:0] = [here, os.path.dirname(here), os.path.join(os.path.dirname(os.path.dirname(here)), "aem-blender-plugin")]
+
+from aem import aem_core  # noqa: E402
+import fmt_aem  # noqa: E402
+
+
+def main(paths):
+    failed = 0
+    for path in paths:
+        with open(path, "rb") as file:
+            data = file.read()
+        models = []
+        with contextlib.redirect_stdout(io.StringIO()):
+            start = time.perf_counter()
+            try:
+                aem_core.decode(data)
+            except ValueError:
+                pass
+            decoded = time.perf_counter() - start
+            start = time.perf_counter()
+            ok = fmt_aem.aemCheckType(data) == 1 and fmt_aem.aemLoadModel(data, models) == 1
+            elapsed = time.perf_counter() - start
+        if not ok:
+            failed += 1
+            print(f"FAILED\t{path}")
+            continue
+        model = models[0]
+        vertices = sum(len(m.positions) for m in model.meshes)
+        triangles = sum(len(m.indices) // 3 for m in model.meshes)
+        print(f"ok\tdecode {decoded * 1000:.1f} ms, load {elapsed * 1000:.1f} ms\t{len(model.meshes)} meshes, {vertices} vertices, {triangles} triangles, {len(model.anims)} anims\t{path}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
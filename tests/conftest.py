@@ -0,0 +1,101 @@
+import importlib.util
+import io
+import os
+import struct
+import sys
+import numpy as np
+import pytest
+
+PLUGIN_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "aem-blender-plugin")
+# the aem package is imported as a top-level package, like the tools and Noesis do
+sys.path.insert(0, PLUGIN_DIR)
+
+from aem import aem_core, aem_writer  # noqa: E402
+
+
+def make_aem(version, flags=0x17, submeshes=2, vertices=20, faces=10, seed=0):
+    """AEM with random content which every version stores exactly or within its quantization step."""
+    rng = np.random.default_rng(seed)
+    aem = aem_core.AEM(version, flags)
+    for _ in range(1 if version in (1, 2) else submeshes):
+        submesh = aem_core.Submesh()
+        submesh.indices = rng.integers(0, vertices, (faces, 3)).astype(np.uint16)
+        submesh.positions = rng.integers(-100, 100, (vertices, 3)).astype(np.float32)
+        submesh.uvs = rng.random((vertices, 2)).astype(np.float32)
+        normals = rng.normal(size=(vertices, 3))
+        submesh.normals = (normals / np.linalg.norm(normals, axis=1, keepdims=True)).astype(np.float32)
+        if version in (3, 4, 5):
+            submesh.pivot = rng.normal(size=3).astype(np.float32)
+            submesh.bounding_sphere = np.array([0, 0, 0, 200], dtype=np.float32)
+        if version == 1:
+            submesh.is_transparent = 1
+        aem.submeshes.append(submesh)
+    return aem
+
+
+def animation_block(flags, n):
+    """Animation block with n keys per track: split translation, XYZ rotation, empty scale."""
+    block = struct.pack("<h", 0)
+    for axis in range(3):
+        block += struct.pack("<h", n) + np.arange(2 * n, dtype="<f4").tobytes()
+    block += struct.pack("<hh", 1, n) + np.arange(4 * n, dtype="<f4").tobytes()
+    block += struct.pack("<4h", 0, 0, 0, 0)
+    if flags & (8 | 16):
+        block += struct.pack("<hh", 2, n) + np.arange(2 * n, dtype="<f4").tobytes()
+    if flags & 16:
+        block += struct.pack("<h", 1)
+        for i in range(7):
+            block += struct.pack("<h", n) + np.arange(2 * n, dtype="<f4").tobytes()
+        block += b"\x00\x00"
+    return block
+
+
+def animated_file(version=5, flags=0x17, n=4):
+    """Two submesh file whose last submesh ends with an animation block of n keys per track."""
+    aem = make_aem(version, flags)
+    buffer = io.BytesIO()
+    aem_writer.write_file(buffer, aem)
+    data = buffer.getvalue()[:-len(aem_writer.empty_animation(flags))]
+    return data + animation_block(flags, n), len(animation_block(flags, n))
+
+
+@pytest.fixture
+def aem_file(tmp_path):
+    """Writes make_aem(version, **kwargs) to a file, returns its path."""
+
+    def write(version, name="mesh.aem", **kwargs):
+        path = tmp_path / name
+        aem_writer.write(str(path), make_aem(version, **kwargs))
+        return str(path)
+
+    return write
+
+
+@pytest.fixture
+def inject_failure(monkeypatch):
+    """Makes target.name, or target[name] of a dict, raise an unexpected error. Returns the reported message."""
+
+    def inject(target, name):
+        def broken(*args, **kwargs):
+            raise struct.error("broken")
+
+        if isinstance(target, dict):
+            monkeypatch.setitem(target, name, broken)
+        else:
+            monkeypatch.setattr(target, name, broken)
+        return "error: broken"
+
+    return inject
+
+
+@pytest.fixture(scope="session")
+def addon():
+    """The Blender addon imported as a package, skips the test without the bpy module."""
+    pytest.importorskip("bpy")
+    spec = importlib.util.spec_from_file_location(
+        "aem_blender_plugin", os.path.join(PLUGIN_DIR, "__init__.py"), submodule_search_locations=[PLUGIN_DIR]
+    )
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
@@ -0,0 +1,49 @@
+import os
+import numpy as np
+
+from aem import aem_cache, aem_core, aem_writer
+from conftest import make_aem
+
+
+def test_load_round_trip(tmp_path, aem_file):
+    path = aem_file(5)
+    cache = aem_cache.AEMCache(directory=str(tmp_path / "cache"))
+    decoded = aem_core.decode(path)
+    cached = cache.load(path)
+    assert cache.misses == 1
+    for expected, submesh in zip(decoded.submeshes, cached.submeshes):
+        assert np.array_equal(submesh.positions, expected.positions)
+        assert np.array_equal(submesh.indices, expected.indices)
+
+    fresh = aem_cache.AEMCache(directory=cache.directory)
+    from_disk = fresh.load(path)
+    assert fresh.hits == 1
+    assert np.array_equal(from_disk.submeshes[0].normals, decoded.submeshes[0].normals)
+
+
+def test_memory_tier_does_not_map_the_file(tmp_path, aem_file):
+    path = aem_file(5)
+    cache = aem_cache.AEMCache(directory=str(tmp_path / "cache"))
+    cache.put(path, aem_core.decode(path))
+    cached = cache.get(path)
+    for submesh in cached.submeshes:
+        for name in aem_cache.SUBMESH_ARRAYS:
+            array = getattr(submesh, name)
+            if array is not None:
+                assert array.flags.writeable and array.base is None, name
+
+
+def test_overwritten_file_is_decoded_again(tmp_path, aem_file):
+    path = aem_file(5)
+    cache = aem_cache.AEMCache(directory=str(tmp_path / "cache"))
+    cache.put(path, aem_core.decode(path))
+    assert cache.get(path) is not None
+
+    replacement = make_aem(5, seed=1)
+    aem_writer.write(path, replacement)  # fails on Windows while the old mapping is alive
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert cache.get(path) is None
+    loaded = cache.load(path)
+    for expected, submesh in zip(replacement.submeshes, loaded.submeshes):
+        assert np.array_equal(submesh.positions, expected.positions)
@@ -0,0 +1,36 @@
+import os
+
+from aem import aem_catalog, aem_core
+
+
+def rows(db, sql):
+    return db.execute(sql).fetchall()
+
+
+def test_refresh_indexes_changed_files_only(tmp_path, aem_file):
+    library = tmp_path / "library"
+    library.mkdir()
+    first = aem_file(5, name="library/a.aem", submeshes=3, vertices=12)
+    aem_file(1, name="library/b.aem")
+    (library / "bad.aem").write_bytes(b"not a mesh")
+    db = aem_catalog.connect(str(tmp_path / "catalog.db"))
+
+    assert aem_catalog.refresh(db, [str(library)], workers=1) == (2, 1, 0, 0)
+    assert rows(db, "SELECT submesh_count, vertices FROM assets WHERE path LIKE '%a.aem'") == [(3, 36)]
+    assert rows(db, "SELECT error FROM files WHERE path LIKE '%bad.aem'")[0][0].startswith("ValueError")
+
+    assert aem_catalog.refresh(db, [str(library)], workers=1) == (0, 0, 0, 3)
+
+    st = os.stat(first)
+    os.utime(first, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    os.remove(library / "b.aem")
+    assert aem_catalog.refresh(db, [str(library)], workers=1) == (1, 0, 1, 1)
+    assert rows(db, "SELECT COUNT(*) FROM submeshes") == [(3,)]
+    db.close()
+
+
+def test_catalog_file_records_unexpected_errors(aem_file, inject_failure):
+    message = inject_failure(aem_core, "index_file")
+    file_row, submesh_rows = aem_catalog.catalog_file(aem_file(5))
+    assert file_row[-1] == message
+    assert submesh_rows == []
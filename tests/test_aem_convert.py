@@ -0,0 +1,27 @@
+import json
+
+from aem import aem_convert
+
+
+def test_convert_gltf(tmp_path, aem_file):
+    out_path = str(tmp_path / "out" / "mesh.gltf")
+    file_path, error, _ = aem_convert.convert_file(aem_file(5), out_path, "gltf")
+    assert error is None
+    with open(out_path, "rb") as file:
+        gltf = json.loads(file.read())
+    assert len(gltf["meshes"]) == 2
+
+
+def test_convert_reports_invalid_files(tmp_path):
+    bad = tmp_path / "bad.aem"
+    bad.write_bytes(b"not a mesh")
+    _, error, _ = aem_convert.convert_file(str(bad), str(tmp_path / "bad.glb"), "glb")
+    assert error.startswith("ValueError")
+
+
+def test_convert_failure_leaves_no_output(tmp_path, aem_file, inject_failure):
+    message = inject_failure(aem_convert.WRITERS, "glb")
+    out_path = tmp_path / "mesh.glb"
+    _, error, _ = aem_convert.convert_file(aem_file(5), str(out_path), "glb")
+    assert error == message
+    assert not out_path.exists() and not (tmp_path / "mesh.glb.part").exists()
@@ -0,0 +1,121 @@
+import io
+import os
+import struct
+import numpy as np
+import pytest
+
+from aem import aem_core, aem_writer
+from conftest import animated_file, make_aem
+
+
+@pytest.mark.parametrize("version", [1, 2, 3, 4, 5])
+def test_load_matches_decode(aem_file, version):
+    path = aem_file(version)
+    decoded = aem_core.decode(path)
+    loaded = aem_core.load(path)
+    assert len(loaded.submeshes) == len(decoded.submeshes)
+    for expected, submesh in zip(decoded.submeshes, loaded.submeshes):
+        for name in ("pivot", "indices", "positions", "uvs", "normals", "bounding_sphere", "is_transparent"):
+            value = getattr(expected, name)
+            if value is None:
+                assert getattr(submesh, name) is None, name
+            else:
+                assert np.array_equal(getattr(submesh, name), value), name
+
+
+def test_load_selected_submesh_and_channels(aem_file):
+    path = aem_file(5, submeshes=3, vertices=12, faces=7)
+    decoded = aem_core.decode(path)
+    aem = aem_core.load(path, submeshes=[2], channels=("uvs",))
+    submesh = aem.submeshes[0]
+    assert submesh.index == 2
+    assert submesh.positions is None and submesh.normals is None and submesh.animation is None
+    assert not aem.normals_present and aem.uvs_present
+    assert "uvs" not in vars(submesh)  # decoded on first access
+    assert np.array_equal(submesh.uvs, decoded.submeshes[2].uvs)
+    assert submesh.vertex_count == 12 and submesh.face_count == 7
+
+
+def test_load_rejects_bad_selection(aem_file):
+    path = aem_file(5, submeshes=2)
+    with pytest.raises(ValueError):
+        aem_core.load(path, submeshes=[2])
+    with pytest.raises(ValueError):
+        aem_core.load(path, channels=("colors",))
+
+
+def key_count(submesh):
+    if submesh.animation is None:
+        return 0
+    return sum(len(track) for track in submesh.animation.tracks.values())
+
+
+@pytest.mark.parametrize("flags", [0x07, 0x17, 0x1F])
+def test_index_counts_animation_keys(flags):
+    data, _ = animated_file(flags=flags)
+    toc = aem_core.aem_index(data)
+    decoded = aem_core.decode(data)
+    assert [e.key_count for e in toc.submeshes] == [key_count(s) for s in decoded.submeshes]
+    assert toc.submeshes[-1].offset + toc.submeshes[-1].length == len(data)
+
+
+@pytest.mark.parametrize("n, spacing", [(1, 1000), (4, 2)])
+def test_time_between_frames(n, spacing, capsys):
+    data, _ = animated_file(n=n)  # key times 0, 2, 4, ...
+    transform = aem_core.decode(data).submeshes[-1].animation
+    assert transform.timeBetweenFrames == spacing
+    assert "Invalid" not in capsys.readouterr().out
+
+
+def test_index_accepts_what_decode_accepts_on_truncated_animation():
+    data, anim_length = animated_file()
+    for cut in range(1, anim_length + 1):
+        truncated = data[:-cut]
+        try:
+            decoded = aem_core.decode(truncated)
+        except ValueError:
+            decoded = None
+        try:
+            toc = aem_core.aem_index(truncated)
+            loaded = aem_core.load(truncated)
+        except ValueError:
+            toc = None
+        assert (decoded is None) == (toc is None), cut
+        if decoded is not None:
+            assert [e.key_count for e in toc.submeshes] == [key_count(s) for s in decoded.submeshes], cut
+            assert [key_count(s) for s in loaded.submeshes] == [key_count(s) for s in decoded.submeshes], cut
+
+
+def test_index_rejects_truncated_geometry(aem_file):
+    with open(aem_file(5), "rb") as file:
+        data = file.read()
+    with pytest.raises(ValueError):
+        aem_core.aem_index(data[:40])
+
+
+@pytest.mark.parametrize("version", [1, 2, 3, 4, 5])
+@pytest.mark.parametrize("flags", [0x07, 0x1F])
+def test_index_offsets_match_decode(aem_file, version, flags):
+    path = aem_file(version, flags=flags, submeshes=3)
+    decoded = aem_core.decode(path)
+    toc = aem_core.aem_index(path)
+    assert (toc.version, toc.flags, toc.size) == (decoded.version, decoded.flags, os.path.getsize(path))
+    assert len(toc.submeshes) == len(decoded.submeshes)
+    reader = aem_core.reader_for(path)
+    end = toc.submeshes[0].offset
+    for entry, submesh in zip(toc.submeshes, decoded.submeshes):
+        assert entry.offset == end
+        assert (entry.face_count, entry.vertex_count) == (submesh.face_count, submesh.vertex_count)
+        if submesh.pivot is not None:
+            assert np.array_equal(entry.pivot, submesh.pivot)
+            assert np.array_equal(entry.bounding_sphere, submesh.bounding_sphere)
+        # sections are contiguous apart from the count fields and each decodes to the same array
+        sections = sorted(entry.sections.values())
+        assert sections[-1][0] + sections[-1][1] == entry.offset + entry.length
+        for name in aem_core.vertex_blocks(toc):
+            reader.seek(entry.sections[name][0])
+            block = aem_core.read_vertex_block(reader, toc.version, name, entry.vertex_count)
+            assert reader.tell() == sum(entry.sections[name])
+            assert np.array_equal(block, getattr(submesh, name))
+        end = entry.offset + entry.length
+    assert end == toc.size
@@ -0,0 +1,77 @@
+import io
+import numpy as np
+import pytest
+
+from aem import aem_core, aem_writer, fixed_point
+from conftest import make_aem
+
+
+def round_trip(aem, stats=None):
+    buffer = io.BytesIO()
+    aem_writer.write_file(buffer, aem, stats)
+    return aem_core.decode(buffer.getvalue())
+
+
+@pytest.mark.parametrize("version", [1, 2, 3, 4, 5])
+@pytest.mark.parametrize("flags", [0x07, 0x17, 0x1F])
+def test_round_trip(version, flags):
+    aem = make_aem(version, flags)
+    decoded = round_trip(aem)
+    assert (decoded.version, decoded.flags) == (version, flags)
+    assert len(decoded.submeshes) == len(aem.submeshes)
+    uv_step = 0.5 / (1 << fixed_point.UV_FRAC_BITS) + 1e-6
+    normal_step = 0.5 / (1 << fixed_point.NORMALS_FRAC_BITS) + 1e-6
+    for expected, submesh in zip(aem.submeshes, decoded.submeshes):
+        assert np.array_equal(submesh.positions, expected.positions)  # integral, exact in every version
+        if version == 1:  # strips may start a triangle at another corner
+            assert sorted(map(sorted, submesh.indices.tolist())) == sorted(map(sorted, expected.indices.tolist()))
+            assert submesh.is_transparent == 1
+        else:
+            assert np.array_equal(submesh.indices, expected.indices)
+        tolerance = (0, 0) if version in (4, 5) else (uv_step, normal_step)
+        assert np.abs(submesh.uvs - expected.uvs).max() <= tolerance[0]
+        assert np.abs(submesh.normals - expected.normals).max() <= tolerance[1]
+        if version in (3, 4, 5):
+            assert np.array_equal(submesh.pivot, expected.pivot)
+            assert np.array_equal(submesh.bounding_sphere, expected.bounding_sphere)
+            assert submesh.animation is None  # written without keys
+        if flags & 8:
+            assert submesh.attrs is not None
+
+
+def test_v1_reports_strip_savings():
+    stats = {}
+    round_trip(make_aem(1), stats)
+    assert stats["indices_list"] == 30 and 0 < stats["indices_written"] <= 30
+
+
+@pytest.mark.parametrize("version", [1, 2])
+def test_single_submesh_versions(version):
+    aem = make_aem(5)
+    aem.version = version
+    with pytest.raises(ValueError):
+        aem_writer.write_file(io.BytesIO(), aem)
+
+
+@pytest.mark.parametrize("version", [1, 2, 3, 4, 5])
+def test_rejects_out_of_range_indices(version):
+    aem = make_aem(version)
+    aem.submeshes[0].indices[0, 0] = 20
+    with pytest.raises(ValueError):
+        aem_writer.write_file(io.BytesIO(), aem)
+
+
+def test_quantization_errors():
+    aem = make_aem(5)
+    assert aem_writer.quantization_errors(aem)["uvs"] == (0.0, 0.0)
+    errors = aem_writer.quantization_errors(aem, version=3)
+    assert errors["positions"][0] == 0.0
+    assert 0 < errors["uvs"][0] <= 0.5 / (1 << fixed_point.UV_FRAC_BITS) + 1e-6
+
+
+def test_smallest_version():
+    aem = make_aem(5)
+    assert aem_writer.smallest_version(aem, tolerance=0.01) == 3
+    assert aem_writer.smallest_version(aem, tolerance=0.0) == 5
+    single = make_aem(2)
+    assert aem_writer.smallest_version(single, tolerance=0.01) == 2
@@ -0,0 +1,36 @@
+import numpy as np
+
+from aem import fixed_point
+
+
+def test_dequantize():
+    assert fixed_point.dequantize(np.array([315], dtype=np.int16), 8)[0] == np.float32(1.23046875)
+
+
+def test_quantize_round_trip_within_half_a_step():
+    values = np.random.default_rng(0).uniform(-7.9, 7.9, (100, 2)).astype(np.float32)
+    decoded = fixed_point.dequantize(fixed_point.quantize(values, fixed_point.UV_FRAC_BITS), fixed_point.UV_FRAC_BITS)
+    assert np.abs(decoded - values).max() <= 0.5 / (1 << fixed_point.UV_FRAC_BITS) + 1e-6
+
+
+def test_quantize_saturates():
+    assert fixed_point.quantize(np.array([2.0, -2.0]), fixed_point.NORMALS_FRAC_BITS).tolist() == [0x7FFF, -0x8000]
+
+
+def test_sign_split_round_trip():
+    positions = np.array([[0, -1, 2], [-300, 300, -32768]], dtype=np.float32)
+    block = fixed_point.encode_sign_split(positions)
+    assert block[0].tolist() == [0, 0, -1, -1, 2, 0]
+    assert np.array_equal(fixed_point.decode_sign_split(block), positions)
+
+
+def test_sign_split_negates_mismatched_sign_words():
+    # a positive value with a negative sign word and the other way around
+    block = np.array([[5, -1, -5, 0, 7, 0]], dtype=np.int16)
+    assert fixed_point.decode_sign_split(block).tolist() == [[-5, 5, 7]]
+
+
+def test_quantization_error():
+    max_error, rms_error = fixed_point.quantization_error(np.array([0.25, 0.5]), 1)
+    assert (max_error, rms_error) == (0.25, np.sqrt(0.03125))
+    assert fixed_point.quantization_error(np.zeros(0), 12) == (0.0, 0.0)
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from aem import aem_core, aem_writer
+from conftest import animated_file
+
+
+@pytest.fixture
+def scene(addon):
+    import bpy
+
+    bpy.ops.wm.read_factory_settings(use_empty=True)
+    return bpy
+
+
+def test_import_twice_into_one_scene(tmp_path, addon, scene):
+    path = tmp_path / "animated.aem"
+    path.write_bytes(animated_file()[0])
+    first = addon.importer.import_aem(str(path), use_cache=False)[0]
+    second = addon.importer.import_aem(str(path), use_cache=False)[0]
+    assert first != second
+    for armature_obj in (first, second):
+        assert "submesh_2" in armature_obj.data.bones
+        fcurves = armature_obj.animation_data.action.fcurves
+        location = fcurves.find('pose.bones["submesh_2"].location', index=0)
+        assert len(location.keyframe_points) == 4
+
+
+def test_animation_replaces_existing_curves(tmp_path, addon, scene):
+    path = tmp_path / "animated.aem"
+    path.write_bytes(animated_file()[0])
+    armature_obj = addon.importer.import_aem(str(path), use_cache=False)[0]
+    transform = aem_core.decode(str(path)).submeshes[1].animation
+    addon.importer.build_animation(transform, "submesh_2", armature_obj)
+    location = armature_obj.animation_data.action.fcurves.find('pose.bones["submesh_2"].location', index=0)
+    assert len(location.keyframe_points) == 4
+
+
+def test_parse_submeshes_keeps_first_occurrence_order(addon):
+    assert addon.importer.parse_submeshes("4-6, 1, 5, 2-3") == [3, 4, 5, 0, 1, 2]
+    assert addon.importer.parse_submeshes(" ") is None
+    with pytest.raises(ValueError):
+        addon.importer.parse_submeshes("3-1")
+
+
+def test_operator_cancels_a_failed_import(aem_file, addon, scene):
+    addon.register()
+    try:
+        with pytest.raises(RuntimeError, match="could not be imported"):
+            scene.ops.import_scene.aem(filepath=aem_file(5), submesh_selection="9")
+    finally:
+        addon.unregister()
+    assert not scene.data.objects
+
+
+def test_weld_keeps_hard_edges(tmp_path, addon, scene):
+    aem = aem_core.AEM(5, 0x17)
+    submesh = aem_core.Submesh()
+    submesh.indices = np.arange(6, dtype=np.uint16).reshape(-1, 3)
+    submesh.positions = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 0], [1, 0, 0], [0, 0, 1]], dtype=np.float32)
+    submesh.uvs = np.zeros((6, 2), dtype=np.float32)
+    submesh.pivot = np.zeros(3, dtype=np.float32)
+    submesh.bounding_sphere = np.array([0, 0, 0, 2], dtype=np.float32)
+    path = str(tmp_path / "hinge.aem")
+    # hard edge, each face has its own normal
+    submesh.normals = np.array([[0, 0, 1]] * 3 + [[0, -1, 0]] * 3, dtype=np.float32)
+    aem.submeshes = [submesh]
+    aem_writer.write(path, aem)
+    addon.importer.import_aem(path, use_cache=False)
+    # smooth edge, the edge vertices share their normals
+    submesh.normals = np.tile(np.array([[0, -0.6, 0.8]], dtype=np.float32), (6, 1))
+    aem_writer.write(path, aem)
+    addon.importer.import_aem(path, use_cache=False)
+    hard, smooth = sorted((obj for obj in scene.data.objects if obj.type == "MESH"), key=lambda obj: obj.name)
+    assert len(hard.data.vertices) == 6
+    assert len(smooth.data.vertices) == 4
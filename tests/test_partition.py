@@ -0,0 +1,30 @@
+import numpy as np
+
+from aem import partition
+
+
+def test_bounding_sphere():
+    positions = np.array([[0, 0, 0], [2, 0, 0], [0, 2, 2]], dtype=np.float32)
+    assert np.allclose(partition.bounding_sphere(positions), [1, 1, 1, np.sqrt(3)])
+    assert partition.bounding_sphere(np.zeros((0, 3))).tolist() == [0, 0, 0, 0]
+
+
+def test_small_mesh_is_not_split():
+    positions = np.zeros((3, 3), dtype=np.float32)
+    indices = np.array([[0, 1, 2]])
+    [(channels, part)] = partition.split_submeshes(indices, [positions])
+    assert channels[0] is positions and np.array_equal(part, indices)
+
+
+def test_split_keeps_every_triangle():
+    rng = np.random.default_rng(0)
+    positions = rng.random((400, 3)).astype(np.float32)
+    uvs = rng.random((400, 2)).astype(np.float32)
+    indices = rng.integers(0, 400, (1000, 3))
+    parts = partition.split_submeshes(indices, [positions, uvs], max_faces=300)
+    assert [len(part) for _, part in parts] == [300, 300, 300, 100]
+    corners = lambda p, i: sorted(map(tuple, p[i].reshape(-1, 9).tolist()))
+    split = sum((corners(channels[0], part) for channels, part in parts), [])
+    assert sorted(split) == corners(positions, indices)
+    for (part_positions, part_uvs), part in parts:
+        assert len(part_positions) == len(part_uvs) and part.max() < len(part_positions)
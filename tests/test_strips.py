@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from aem import strips
+
+
+def canonical(faces):
+    """Triangles rotated to start at their smallest index, which keeps the winding."""
+    faces = np.asarray(faces, dtype=np.int64).reshape(-1, 3)
+    shift = faces.argmin(axis=1)
+    rows = np.arange(len(faces))[:, None]
+    return sorted(map(tuple, faces[rows, (shift[:, None] + np.arange(3)) % 3].tolist()))
+
+
+def grid(width, height):
+    """Triangulated width x height grid of quads with consistent winding."""
+    faces = []
+    for y in range(height):
+        for x in range(width):
+            a = y * (width + 1) + x
+            b, c, d = a + 1, a + width + 1, a + width + 2
+            faces += [(a, b, c), (c, b, d)]
+    return np.array(faces, dtype=np.uint16)
+
+
+def test_unpack_strips_flips_odd_triangles():
+    faces = strips.unpack_strips(np.array([0, 1, 2, 3, 4]), np.array([5]))
+    assert faces.tolist() == [[0, 1, 2], [1, 3, 2], [2, 3, 4]]
+
+
+def test_unpack_strips_drops_degenerate_triangles():
+    indices = np.array([0, 1, 2, 2, 3, 4, 5])
+    assert strips.unpack_strips(indices, [7]).tolist() == [[0, 1, 2], [2, 4, 3], [3, 4, 5]]
+    assert len(strips.unpack_strips(indices, [7], drop_degenerate=False)) == 5
+
+
+def test_unpack_strips_past_the_buffer():
+    with pytest.raises(IndexError):
+        strips.unpack_strips(np.array([0, 1, 2]), np.array([4]))
+
+
+def test_unpack_strips_empty():
+    assert strips.unpack_strips(np.zeros(0, dtype=np.uint16), np.zeros(0, dtype=np.int16)).shape == (0, 3)
+
+
+@pytest.mark.parametrize("faces", [grid(1, 1), grid(8, 5), grid(3, 3)[::-1], np.array([[0, 1, 2], [5, 6, 7]], dtype=np.uint16)])
+def test_stripify_round_trip(faces):
+    strip_indices, strip_lengths = strips.stripify(faces)
+    assert strip_indices.dtype == faces.dtype and strip_lengths.dtype == np.int16
+    assert canonical(strips.unpack_strips(strip_indices, strip_lengths)) == canonical(faces)
+
+
+def test_stripify_joins_a_grid_row():
+    strip_indices, strip_lengths = strips.stripify(grid(10, 1))
+    assert len(strip_lengths) == 1
+
+
+def test_stripify_caps_strip_length(monkeypatch):
+    monkeypatch.setattr(strips, "MAX_STRIP_LENGTH", 8)
+    faces = grid(10, 1)
+    strip_indices, strip_lengths = strips.stripify(faces)
+    assert strip_lengths.max() <= 8
+    assert canonical(strips.unpack_strips(strip_indices, strip_lengths)) == canonical(faces)
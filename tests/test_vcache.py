@@ -0,0 +1,40 @@
+import numpy as np
+
+from aem import vcache
+
+
+def test_tipsify_empty():
+    indices = np.zeros((0, 3), dtype=np.uint16)
+    assert vcache.tipsify(indices, 0).shape == (0, 3)
+    assert vcache.tipsify(indices, 5).shape == (0, 3)
+
+
+def test_optimize_empty():
+    channels, indices = vcache.optimize(np.zeros((0, 3), dtype=np.uint16), [np.zeros((0, 3), dtype=np.float32)])
+    assert indices.shape == (0, 3)
+    assert len(channels[0]) == 0
+
+
+def test_tipsify_single_triangle():
+    indices = np.array([[0, 1, 2]], dtype=np.uint16)
+    assert np.array_equal(vcache.tipsify(indices, 3), indices)
+
+
+def test_tipsify_keeps_triangles():
+    rng = np.random.default_rng(0)
+    indices = rng.integers(0, 50, (200, 3))
+    reordered = vcache.tipsify(indices, 50)
+    assert sorted(map(tuple, reordered.tolist())) == sorted(map(tuple, indices.tolist()))
+
+
+def test_optimize_reorders_vertices_by_first_use():
+    rng = np.random.default_rng(1)
+    positions = rng.random((30, 3))
+    indices = rng.integers(0, 30, (40, 3))
+    (new_positions,), new_indices = vcache.optimize(indices, [positions])
+    used, first = np.unique(new_indices.ravel(), return_index=True)
+    assert np.array_equal(used, np.arange(len(new_positions)))
+    assert np.all(np.diff(first) > 0)  # vertex i is first used before vertex i + 1
+    assert sorted(map(tuple, new_positions[new_indices].reshape(-1, 9).round(9).tolist())) == sorted(
+        map(tuple, positions[indices].reshape(-1, 9).round(9).tolist())
+    )
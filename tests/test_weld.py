@@ -0,0 +1,48 @@
+import numpy as np
+
+from aem import weld
+
+
+def test_deduplicate_merges_equal_corners():
+    positions = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [1, 0, 0], [0, 1, 0], [1, 1, 0]], dtype=np.float32)
+    uvs = np.zeros((6, 2), dtype=np.float32)
+    indices = np.arange(6).reshape(-1, 3)
+    (new_positions, new_uvs), new_indices = weld.deduplicate(indices, [positions, uvs])
+    assert len(new_positions) == 4 and len(new_uvs) == 4
+    assert np.array_equal(new_positions[new_indices], positions[indices])
+
+
+def test_deduplicate_keeps_corners_with_different_channels():
+    positions = np.zeros((3, 3), dtype=np.float32)
+    uvs = np.array([[0, 0], [0, 1], [0, 0]], dtype=np.float32)
+    (new_positions, _), new_indices = weld.deduplicate(np.arange(3).reshape(1, 3), [positions, uvs])
+    assert len(new_positions) == 2
+    assert new_indices.tolist() == [[0, 1, 0]]
+
+
+def test_deduplicate_empty():
+    channels = [np.zeros((0, 3), dtype=np.float32), np.zeros((0, 2), dtype=np.float32)]
+    (positions, uvs), indices = weld.deduplicate(np.zeros((0, 3), dtype=np.uint32), channels)
+    assert positions.shape == (0, 3) and uvs.shape == (0, 2)
+    assert indices.shape == (0, 3)
+
+
+def hinge():
+    """Two triangles folded at a 90 degree edge, the edge vertices stored once per face with that face's normal."""
+    positions = np.array([[0, 0, 0], [1, 0, 0], [0, 1, 0], [0, 0, 0], [1, 0, 0], [0, 0, 1]], dtype=np.float32)
+    normals = np.array([[0, 0, 1]] * 3 + [[0, -1, 0]] * 3, dtype=np.float32)
+    return positions, np.arange(6).reshape(-1, 3), normals
+
+
+def test_weld_mesh_keeps_split_normal_seam():
+    positions, indices, normals = hinge()
+    welded, faces, loop_vertices = weld.weld_mesh(positions, indices, normals=normals)
+    assert len(welded) == 6 and len(faces) == 2
+    assert np.array_equal(normals[loop_vertices], normals[indices.ravel()])
+
+
+def test_weld_mesh_merges_seam_without_normals():
+    positions, indices, _ = hinge()
+    welded, faces, loop_vertices = weld.weld_mesh(positions, indices)
+    assert len(welded) == 4
+    assert np.array_equal(welded[faces], positions[indices])